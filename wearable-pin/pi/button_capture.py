@@ -2,13 +2,22 @@
 """
 Simple button-triggered camera capture for Raspberry Pi Zero 2W
 Arducam 5MP OV5647 camera
-Uses rpicam-still command-line tool
+Uses a persistent Picamera2 instance (falls back to rpicam-still command-line tool)
 """
 
+import importlib.util
+import io
+import itertools
+import mmap
 import os
+import queue
+import shutil
+import signal
 import time
 import subprocess
 import sys
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -20,83 +29,338 @@ except ImportError:
     print("Error: gpiozero not available. Install with: sudo apt-get install python3-gpiozero")
     exit(1)
 
+# Prefer the lgpio pin factory: edges come from the kernel's GPIO line events
+# (with kernel-side debounce) rather than a polling thread
+from sysinfo import pin_thread, use_lgpio_pin_factory
+use_lgpio_pin_factory()
+
+# The camera itself comes from capture_image.get_camera() (shared instance)
+PICAMERA_AVAILABLE = importlib.util.find_spec("picamera2") is not None
+
+# JPEG re-encoding before upload (optional): libjpeg-turbo first, Pillow as fallback
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _tj = TurboJPEG()
+except (ImportError, OSError):
+    _tj = None
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 # Import configuration
 try:
     import button_config as config
     BUTTON_PIN = config.BUTTON_PIN
     SAVE_DIR = os.path.expanduser(config.SAVE_DIR)
-    RESOLUTION = f"{config.RESOLUTION[0]}x{config.RESOLUTION[1]}"
+    WIDTH, HEIGHT = config.RESOLUTION
     IMAGE_FORMAT = config.IMAGE_FORMAT
     QUALITY = 85  # Default quality
+    WARMUP_TIME = config.WARMUP_TIME
+    BUTTON_DEBOUNCE = config.BUTTON_DEBOUNCE
+    SYNC_INTERVAL = config.SYNC_INTERVAL
+    HARDWARE_JPEG = config.HARDWARE_JPEG
     
     # Cloud upload configuration
     UPLOAD_ENABLED = config.UPLOAD_ENABLED
     UPLOAD_SERVER_URL = config.UPLOAD_SERVER_URL
     UPLOAD_MAX_SIZE_MB = config.UPLOAD_MAX_SIZE_MB
     UPLOAD_TIMEOUT = config.UPLOAD_TIMEOUT
+    UPLOAD_RESIZE = config.UPLOAD_RESIZE
+    UPLOAD_QUALITY = config.UPLOAD_QUALITY
+    UPLOAD_LORES = config.UPLOAD_LORES
 except ImportError:
     # Fallback to hardcoded values if config not available
     BUTTON_PIN = 4
     SAVE_DIR = os.path.expanduser("~/pictures")
-    RESOLUTION = "1920x1080"
+    WIDTH, HEIGHT = 1920, 1080
     IMAGE_FORMAT = "jpg"
     QUALITY = 85
+    WARMUP_TIME = 2
+    BUTTON_DEBOUNCE = 0.5
+    SYNC_INTERVAL = 0
+    HARDWARE_JPEG = False
     UPLOAD_ENABLED = False
     UPLOAD_SERVER_URL = "http://localhost:5001"
     UPLOAD_MAX_SIZE_MB = 20
     UPLOAD_TIMEOUT = 30
+    UPLOAD_RESIZE = None
+    UPLOAD_QUALITY = 75
+    UPLOAD_LORES = None
 
-# Import cloud upload function
-try:
-    from cloud_upload_test import upload_file
-    UPLOAD_AVAILABLE = True
-except ImportError:
-    UPLOAD_AVAILABLE = False
-    if UPLOAD_ENABLED:
-        print("Warning: Cloud upload enabled but cloud_upload_test module not available")
-        print("Install requests: sudo pip3 install requests")
+# rpicam-still arguments that don't change between captures
+_CMD_PREFIX = [
+    "rpicam-still",
+    "--width", str(WIDTH),
+    "--height", str(HEIGHT),
+    "--quality", str(QUALITY),
+    "--timeout", "1000",  # 1 second timeout
+    "--nopreview"  # No preview window
+]
+
+# rpicam-still kept running in signal mode: captures on SIGUSR1, exits on SIGUSR2
+_SIGNAL_CMD = [
+    "rpicam-still",
+    "--width", str(WIDTH),
+    "--height", str(HEIGHT),
+    "--quality", str(QUALITY),
+    "--timeout", "0",  # Run until told to exit
+    "--signal",
+    "--nopreview"
+]
+
+# Edge debounce handled by gpiozero instead of a sleep in the main loop
+BOUNCE_TIME = 0.02
+
+# Maximum captures waiting for upload (bounded so a dead network can't exhaust RAM)
+UPLOAD_QUEUE_SIZE = 32
+
+# Seconds to let queued uploads finish on exit; captures still queued after
+# that are moved to SAVE_DIR without uploading
+SHUTDOWN_UPLOAD_WAIT = 30
+
+# Camera requests waiting for JPEG encoding. Each one pins a full-resolution
+# libcamera buffer, so this stays small; capture_request() itself blocks once
+# all configured buffers are held.
+ENCODE_QUEUE_SIZE = 2
+
+# Captures between malloc_trim() calls (hands freed JPEG/frame memory back to the OS)
+TRIM_INTERVAL = 10
+
+# CPU cores for the capture loop and the two workers (Pi Zero 2W has 4), so the
+# button/capture path never shares a core with JPEG encoding or SD/network I/O
+CAPTURE_CPU = 0
+ENCODE_CPU = 1
+STORAGE_CPU = 2
+
+# RAM-backed staging directory: captures land here, then move to SAVE_DIR in the background
+FAST_DIR = "/dev/shm/wearable_pin"
+
+# Cloud upload module is imported on first use: requests pulls in a large
+# dependency tree that --no-upload / UPLOAD_ENABLED=False runs never need
+UPLOAD_AVAILABLE = (
+    importlib.util.find_spec("requests") is not None
+    and importlib.util.find_spec("cloud_upload_test") is not None
+)
+_upload_api = None
+if UPLOAD_ENABLED and not UPLOAD_AVAILABLE:
+    print("Warning: Cloud upload enabled but cloud_upload_test module not available")
+    print("Install requests: sudo pip3 install requests")
+
+# Persistent camera instance (started once in main(), reused for every press)
+_picam2 = None
+_lores_enabled = False
+_hw_camera = None  # Shared CameraCapture when captures use its hardware JPEG path
+
+# Persistent rpicam-still --signal process (fallback when picamera2 is missing)
+_rpicam = None
+_rpicam_pattern = None
+_rpicam_count = 0
+
+# Persistent upload client (keeps the TLS connection to the server alive)
+_client = None
 
 
 def check_rpicam():
     """Check if rpicam-still is available."""
+    return shutil.which("rpicam-still") is not None
+
+
+def get_mount_options(path):
+    """Return the mount options for the filesystem containing path."""
+    path = os.path.realpath(path)
+    best_mount = ""
+    best_options = []
     try:
-        result = subprocess.run(
-            ["which", "rpicam-still"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return True
-        else:
-            return False
-    except:
-        return False
+        with open("/proc/mounts", "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 4:
+                    continue
+                mount_point, options = fields[1], fields[3]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) \
+                        and len(mount_point) > len(best_mount):
+                    best_mount = mount_point
+                    best_options = options.split(",")
+    except OSError:
+        pass
+    return best_options
+
+
+def sync_worker(interval):
+    """Periodically flush dirty pages to disk instead of syncing per capture."""
+    while True:
+        time.sleep(interval)
+        os.sync()
+
+
+def start_camera(with_lores=False):
+    """
+    Start the shared Picamera2 instance so each press skips libcamera setup.
+    
+    Args:
+        with_lores: Also configure the UPLOAD_LORES stream for uploads
+    """
+    global _picam2, _lores_enabled, _hw_camera
+    import capture_image
+    lores_size = None
+    if with_lores and _tj is None:
+        print("⚠ UPLOAD_LORES needs PyTurboJPEG to encode the low-res stream, ignoring")
+    elif with_lores:
+        # Second stream scaled by the ISP from the same sensor readout
+        # (keep the width a multiple of 64 so the YUV420 rows have no padding)
+        lores_size = UPLOAD_LORES
+    use_hardware_jpeg = HARDWARE_JPEG and lores_size is None
+    if HARDWARE_JPEG and not use_hardware_jpeg:
+        print("⚠ HARDWARE_JPEG can't produce the UPLOAD_LORES stream, encoding on the CPU")
+    # Configures, starts and warms up the camera once per process
+    camera = capture_image.get_camera(resolution=(WIDTH, HEIGHT), lores_size=lores_size,
+                                      hardware_jpeg=use_hardware_jpeg, quality=QUALITY)
+    if camera is None:
+        raise RuntimeError("camera initialization failed")
+    _picam2 = camera.camera
+    _lores_enabled = lores_size is not None
+    _hw_camera = camera if use_hardware_jpeg else None
+
+
+def start_rpicam_server(output_dir):
+    """
+    Start rpicam-still in signal mode so libcamera is initialized only once.
+    
+    Args:
+        output_dir: Directory rpicam-still writes its numbered captures to
+    """
+    global _rpicam, _rpicam_pattern, _rpicam_count
+    _rpicam_pattern = os.path.join(output_dir, "rpicam_%05d.jpg")
+    _rpicam_count = 0
+    _rpicam = subprocess.Popen(
+        [*_SIGNAL_CMD, "-o", _rpicam_pattern],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    time.sleep(WARMUP_TIME)
+
+
+def stop_camera():
+    """Stop and close the persistent camera instance."""
+    global _picam2, _hw_camera, _rpicam
+    if _picam2 is not None:
+        from capture_image import release_camera
+        release_camera()
+        _picam2 = None
+        _hw_camera = None
+    if _rpicam is not None:
+        try:
+            _rpicam.send_signal(signal.SIGUSR2)
+            _rpicam.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            _rpicam.kill()
+            _rpicam.wait()
+        finally:
+            _rpicam = None
 
 
 def capture_image(filepath):
-    """Capture image using rpicam-still and save to filepath."""
+    """Capture image and save to filepath.
+
+    Uses the persistent Picamera2 instance when it has been started,
+    otherwise falls back to spawning rpicam-still.
+    """
+    return capture_image_with_preview(filepath)[0]
+
+
+def capture_image_with_preview(filepath):
+    """
+    Capture image to filepath, also returning the low-res stream if enabled.
+    
+    Returns:
+        tuple: (success, preview) where preview is the YUV420 lores array or None
+    """
+    if _hw_camera is not None:
+        # The VideoCore encoder writes the file; no CPU-side JPEG encode
+        return _hw_camera.capture_image(filepath) is not None, None
+    
+    if _picam2 is not None:
+        try:
+            preview = None
+            if _lores_enabled:
+                request = _picam2.capture_request()
+                try:
+                    request.save("main", filepath)
+                    preview = request.make_array("lores")
+                finally:
+                    request.release()
+            else:
+                _picam2.capture_file(filepath)
+            file_size = os.path.getsize(filepath)
+            file_size_mb = file_size / (1024 * 1024)
+            print(f"✓ Image captured: {filepath}")
+            print(f"  Size: {file_size:,} bytes ({file_size_mb:.2f} MB)")
+            return True, preview
+        except Exception as e:
+            print(f"✗ Capture failed: {e}")
+            return False, None
+    
+    if _rpicam is not None and _rpicam.poll() is None:
+        return _capture_rpicam_signal(filepath), None
+    
+    return _capture_rpicam(filepath), None
+
+
+def _capture_rpicam_signal(filepath, timeout=10):
+    """Trigger a capture on the running rpicam-still process and move it to filepath."""
+    global _rpicam_count
+    output = _rpicam_pattern % _rpicam_count
+    _rpicam_count += 1
+    _rpicam.send_signal(signal.SIGUSR1)
+    
+    # Wait for the numbered file to appear and stop growing
+    deadline = time.monotonic() + timeout
+    last_size = -1
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        try:
+            file_size = os.path.getsize(output)
+        except FileNotFoundError:
+            continue
+        if file_size > 0 and file_size == last_size:
+            shutil.move(output, filepath)
+            file_size_mb = file_size / (1024 * 1024)
+            print(f"✓ Image captured: {filepath}")
+            print(f"  Size: {file_size:,} bytes ({file_size_mb:.2f} MB)")
+            return True
+        last_size = file_size
+    
+    print("✗ Capture timed out")
+    return False
+
+
+def _capture_rpicam(filepath):
+    """Capture image by spawning rpicam-still."""
     try:
         # Build rpicam-still command
-        cmd = [
-            "rpicam-still",
-            "-o", filepath,
-            "--width", str(RESOLUTION.split("x")[0]),
-            "--height", str(RESOLUTION.split("x")[1]),
-            "--quality", str(QUALITY),
-            "--timeout", "1000",  # 1 second timeout
-            "--nopreview"  # No preview window
-        ]
+        cmd = [*_CMD_PREFIX, "-o", filepath]
         
         # Execute capture
+        # Only stderr is kept (and only decoded on failure)
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10
         )
         
-        if result.returncode == 0 and os.path.exists(filepath):
-            file_size = os.path.getsize(filepath)
+        # A single stat: getsize fails if rpicam-still didn't write the file
+        file_size = None
+        if result.returncode == 0:
+            try:
+                file_size = os.path.getsize(filepath)
+            except FileNotFoundError:
+                pass
+        
+        if file_size is not None:
             file_size_mb = file_size / (1024 * 1024)
             print(f"✓ Image captured: {filepath}")
             print(f"  Size: {file_size:,} bytes ({file_size_mb:.2f} MB)")
@@ -104,7 +368,7 @@ def capture_image(filepath):
         else:
             print(f"✗ Capture failed")
             if result.stderr:
-                print(f"  Error: {result.stderr}")
+                print(f"  Error: {result.stderr.decode('utf-8', 'replace')}")
             return False
     except subprocess.TimeoutExpired:
         print("✗ Capture timed out")
@@ -124,12 +388,6 @@ def test_button():
     print("Press Ctrl+C to exit")
     print("=" * 50)
     
-    try:
-        from gpiozero import Button
-    except ImportError:
-        print("Error: gpiozero not available. Install with: sudo apt-get install python3-gpiozero")
-        return
-    
     button = Button(BUTTON_PIN, pull_up=True)
     press_count = 0
     
@@ -150,12 +408,54 @@ def test_button():
         print("Button is working correctly!" if press_count > 0 else "No presses detected.")
 
 
-def upload_captured_image(filepath):
+def _get_upload_api():
+    """Import cloud_upload_test the first time an upload is needed."""
+    global _upload_api
+    if _upload_api is None:
+        import cloud_upload_test as _upload_api
+    return _upload_api
+
+
+def shrink_for_upload(filepath):
+    """
+    Re-encode a captured JPEG to fit within UPLOAD_RESIZE at UPLOAD_QUALITY.
+    
+    Args:
+        filepath: Path to the captured JPEG
+    
+    Returns:
+        bytes: Re-encoded JPEG, or None if no encoder is available
+    """
+    max_w, max_h = UPLOAD_RESIZE
+    if _tj is not None:
+        # Map the file read-only: libjpeg-turbo decodes straight from the page
+        # cache instead of a userspace copy of the whole JPEG
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as jpeg:
+            width, height, _, _ = _tj.decode_header(jpeg)
+            # Decode directly at a reduced DCT scale (no separate resize pass)
+            factors = [
+                (num, denom) for num, denom in _tj.scaling_factors
+                if num <= denom and width * num // denom <= max_w and height * num // denom <= max_h
+            ]
+            factor = max(factors, key=lambda f: f[0] / f[1]) if factors else (1, 8)
+            return _tj.scale_with_quality(jpeg, scaling_factor=factor, quality=UPLOAD_QUALITY)
+    if PIL_AVAILABLE:
+        with Image.open(filepath) as img:
+            img.draft('RGB', UPLOAD_RESIZE)  # Let libjpeg decode at reduced scale
+            img.thumbnail(UPLOAD_RESIZE)
+            buf = io.BytesIO()
+            img.save(buf, format='JPEG', quality=UPLOAD_QUALITY)
+            return buf.getvalue()
+    return None
+
+
+def upload_captured_image(filepath, preview=None):
     """
     Upload a captured image to the cloud server.
     
     Args:
         filepath: Path to the captured image file
+        preview: Optional YUV420 lores frame to upload instead of the file
     
     Returns:
         bool: True if upload successful, False otherwise
@@ -168,15 +468,18 @@ def upload_captured_image(filepath):
         return False
     
     try:
-        max_file_size_bytes = UPLOAD_MAX_SIZE_MB * 1024 * 1024
-        result = upload_file(
-            filepath,
-            server_url=UPLOAD_SERVER_URL,
-            max_file_size=max_file_size_bytes,
-            timeout=UPLOAD_TIMEOUT,
-            check_mem=True,
-            verbose=True
-        )
+        if preview is not None:
+            lores_w, lores_h = UPLOAD_LORES
+            data = _tj.encode_from_yuv(preview, lores_h, lores_w,
+                                       quality=UPLOAD_QUALITY, jpeg_subsample=TJSAMP_420)
+        elif UPLOAD_RESIZE:
+            data = shrink_for_upload(filepath)
+        else:
+            data = None
+        if data is not None:
+            result = _client.upload_bytes(data, os.path.basename(filepath), verbose=True)
+        else:
+            result = _client.upload_file(filepath, verbose=True)
         
         if result["success"]:
             print("✓ Image uploaded successfully")
@@ -203,12 +506,112 @@ def upload_captured_image(filepath):
         return False
 
 
+def persist_capture(tmp_path, final_path):
+    """Move a capture from the RAM-backed staging directory to SAVE_DIR."""
+    if tmp_path == final_path:
+        return
+    try:
+        shutil.move(tmp_path, final_path)
+    except OSError as e:
+        print(f"⚠ Could not move {tmp_path} to {final_path}: {e}")
+
+
+def discard_capture(tmp_path):
+    """Remove a failed capture's partial file so it's never persisted as a real one."""
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠ Could not remove partial capture {tmp_path}: {e}")
+
+
+def wait_queue(q, timeout):
+    """Wait up to timeout seconds for every queued item to be task_done(); True if it drained."""
+    with q.all_tasks_done:
+        return q.all_tasks_done.wait_for(lambda: not q.unfinished_tasks, timeout)
+
+
+def queue_capture(work_q, tmp_path, final_path, preview, upload):
+    """Hand a staged capture to the storage worker, persisting it directly if the queue is full."""
+    try:
+        work_q.put_nowait((tmp_path, final_path, preview))
+    except queue.Full:
+        if upload:
+            print(f"⚠ Upload queue full, not uploading {os.path.basename(tmp_path)}")
+        persist_capture(tmp_path, final_path)
+
+
+def encode_worker(encode_q, work_q, upload):
+    """
+    Background worker that encodes queued Picamera2 requests to JPEG.
+    
+    The capture loop only takes the request (a buffer libcamera has already
+    filled) and goes back to waiting for the button; the JPEG encode, the
+    lores copy and the buffer release happen here.
+    """
+    from capture_image import trim_heap
+    
+    pin_thread({ENCODE_CPU})
+    for count in itertools.count(1):
+        request, tmp_path, final_path = encode_q.get()
+        try:
+            preview = None
+            try:
+                request.save("main", tmp_path)
+                if _lores_enabled:
+                    preview = request.make_array("lores")
+            finally:
+                request.release()
+            file_size = os.path.getsize(tmp_path)
+            file_size_mb = file_size / (1024 * 1024)
+            print(f"✓ Image captured: {tmp_path}")
+            print(f"  Size: {file_size:,} bytes ({file_size_mb:.2f} MB)")
+            queue_capture(work_q, tmp_path, final_path, preview, upload)
+        except Exception as e:
+            print(f"✗ Capture failed: {e}")
+            discard_capture(tmp_path)
+        finally:
+            encode_q.task_done()
+        if count % TRIM_INTERVAL == 0:
+            trim_heap()
+
+
+def storage_worker(work_q, upload):
+    """
+    Background worker that uploads (optionally) and persists queued captures.
+    
+    Uploads read the staged copy in tmpfs, then the file is moved to SAVE_DIR,
+    so neither the network nor the SD card ever blocks the capture loop.
+    """
+    pin_thread({STORAGE_CPU})
+    if upload:
+        # Pre-warm the connection so the first press doesn't pay the TLS handshake
+        try:
+            _client.session.head(UPLOAD_SERVER_URL, timeout=UPLOAD_TIMEOUT)
+        except Exception:
+            pass
+    
+    while True:
+        tmp_path, final_path, preview = work_q.get()
+        try:
+            if upload:
+                print(f"Uploading {os.path.basename(tmp_path)}...")
+                upload_captured_image(tmp_path, preview)
+        finally:
+            persist_capture(tmp_path, final_path)
+            work_q.task_done()
+
+
 def main():
     """Main function."""
+    global _client
+    
     # Check for --no-upload flag
     no_upload = '--no-upload' in sys.argv or '-n' in sys.argv
     if no_upload:
         sys.argv = [arg for arg in sys.argv if arg not in ['--no-upload', '-n']]
+    upload_active = not no_upload and UPLOAD_ENABLED and UPLOAD_AVAILABLE
     
     # Check for test mode
     if len(sys.argv) > 1 and sys.argv[1] in ['--test', '-t', 'test']:
@@ -219,7 +622,7 @@ def main():
     print("Button Camera Capture")
     print("=" * 50)
     print(f"Button GPIO: {BUTTON_PIN}")
-    print(f"Resolution: {RESOLUTION}")
+    print(f"Resolution: {WIDTH}x{HEIGHT}")
     print(f"Save location: {SAVE_DIR}")
     if no_upload:
         print("Cloud upload: DISABLED (--no-upload flag)")
@@ -231,36 +634,82 @@ def main():
         print("Cloud upload: DISABLED (set UPLOAD_ENABLED=True in button_config.py)")
     print("=" * 50)
     
-    # Check if rpicam-still is available
-    if not check_rpicam():
-        print("✗ Error: rpicam-still not found")
+    # Prefer picamera2; otherwise check if rpicam-still is available
+    if PICAMERA_AVAILABLE:
+        print("✓ picamera2 found")
+    elif not check_rpicam():
+        print("✗ Error: neither picamera2 nor rpicam-still found")
         print("\nInstall with:")
-        print("  sudo apt-get install -y libcamera-apps")
+        print("  sudo apt-get install -y python3-picamera2 libcamera-apps")
         print("\nOr check if it's in PATH:")
         print("  which rpicam-still")
         exit(1)
-    
-    print("✓ rpicam-still found")
+    else:
+        print("✓ rpicam-still found (picamera2 not available)")
     
     # Create save directory
     os.makedirs(SAVE_DIR, exist_ok=True)
     print(f"Save directory: {SAVE_DIR}")
+    if "sync" in get_mount_options(SAVE_DIR):
+        print("⚠ Warning: save directory is on a 'sync' mount - every capture will block on disk writes")
+        print("  Remount without 'sync' or set SAVE_DIR to a tmpfs path (e.g. /tmp/captures)")
+    
+    # Stage captures in tmpfs when available
+    capture_dir = SAVE_DIR
+    if os.path.isdir(os.path.dirname(FAST_DIR)):
+        try:
+            os.makedirs(FAST_DIR, exist_ok=True)
+            capture_dir = FAST_DIR
+        except OSError:
+            pass
+    
+    # Optional periodic flush (writeback is otherwise left to the kernel)
+    if SYNC_INTERVAL > 0:
+        threading.Thread(target=sync_worker, args=(SYNC_INTERVAL,), daemon=True).start()
     
     # Setup button
     print(f"\nSetting up button on GPIO {BUTTON_PIN}...")
-    button = Button(BUTTON_PIN, pull_up=True)
+    button = Button(BUTTON_PIN, pull_up=True, bounce_time=BOUNCE_TIME)
+    capture_event = threading.Event()
+    last_press = -BUTTON_DEBOUNCE
+    
+    def on_press():
+        # First press triggers immediately; presses within the refractory
+        # period after it are dropped instead of queueing extra captures
+        nonlocal last_press
+        now = time.monotonic()
+        if now - last_press < BUTTON_DEBOUNCE:
+            return
+        last_press = now
+        capture_event.set()
+    
+    button.when_pressed = on_press
     print("Button ready!")
     
+    # Start camera once; it stays warm for every capture
+    if PICAMERA_AVAILABLE:
+        print("\nStarting camera...")
+        try:
+            start_camera(with_lores=bool(UPLOAD_LORES) and upload_active)
+        except Exception as e:
+            print(f"✗ Failed to start camera: {e}")
+            stop_camera()
+            exit(1)
+    else:
+        # Keep one rpicam-still running instead of spawning it per press
+        print(f"\nStarting rpicam-still (warming up {WARMUP_TIME}s)...")
+        try:
+            start_rpicam_server(capture_dir)
+        except OSError as e:
+            print(f"⚠ Could not start rpicam-still in signal mode ({e}), spawning per capture")
+    
     # Test camera
     print("\nTesting camera...")
-    test_file = os.path.join(SAVE_DIR, "test_camera.jpg")
-    if capture_image(test_file):
+    # Test shot goes to the (tmpfs) staging dir and is removed when the file closes
+    with tempfile.NamedTemporaryFile(suffix=".jpg", dir=capture_dir) as tf:
+        camera_ok = capture_image(tf.name)
+    if camera_ok:
         print("✓ Camera test successful")
-        # Remove test file
-        try:
-            os.remove(test_file)
-        except:
-            pass
     else:
         print("✗ Camera test failed")
         print("\nTroubleshooting:")
@@ -268,50 +717,113 @@ def main():
         print("2. Enable camera: sudo raspi-config")
         print("3. Check camera: rpicam-still --list-cameras")
         print("4. Test manually: rpicam-still -o test.jpg")
+        stop_camera()
         exit(1)
     
+    # Start background worker so network and SD latency never block the button
+    if upload_active:
+        api = _get_upload_api()
+        _client = api.UploadClient(
+            UPLOAD_SERVER_URL,
+            timeout=UPLOAD_TIMEOUT,
+            max_file_size=UPLOAD_MAX_SIZE_MB * 1024 * 1024,
+            session=api.create_session(pool_maxsize=2, retries=2)
+        )
+    work_q = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    threading.Thread(target=storage_worker, args=(work_q, upload_active), daemon=True).start()
+    encode_q = queue.Queue(maxsize=ENCODE_QUEUE_SIZE)
+    use_encode_worker = _picam2 is not None and _hw_camera is None
+    if use_encode_worker:
+        threading.Thread(target=encode_worker, args=(encode_q, work_q, upload_active), daemon=True).start()
+    
     # Main loop
     print("\n" + "=" * 50)
     print("Ready! Press button to capture image...")
     print("Press Ctrl+C to exit")
     print("=" * 50)
     
+    # Filenames: one timestamp per run plus a counter (no sub-second collisions)
+    session_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
+    counter = itertools.count()
+    # Normalize image format (jpeg -> jpg for filename)
+    img_ext = IMAGE_FORMAT.replace("jpeg", "jpg")
+    # Directory prefixes (with trailing separator) so each press is a plain concat
+    capture_prefix = os.path.join(capture_dir, "")
+    save_prefix = os.path.join(SAVE_DIR, "")
+    
+    # Pin only now: libcamera's threads were created above and keep all cores
+    pin_thread({CAPTURE_CPU})
+    
     try:
         while True:
-            # Wait for button press
-            button.wait_for_press()
+            # Wait for button press (signalled from gpiozero's edge callback)
+            capture_event.wait()
+            capture_event.clear()
             print("\nButton pressed! Capturing...")
             
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # Normalize image format (jpeg -> jpg for filename)
-            img_ext = IMAGE_FORMAT.replace("jpeg", "jpg")
-            filename = f"capture_{timestamp}.{img_ext}"
-            filepath = os.path.join(SAVE_DIR, filename)
+            # Generate filename from session timestamp + sequence number
+            filename = f"capture_{session_prefix}_{next(counter):05d}.{img_ext}"
+            tmp_path = capture_prefix + filename
+            filepath = save_prefix + filename
             
             # Capture image
-            if capture_image(filepath):
-                # Attempt to upload if enabled and not disabled by flag
-                if not no_upload:
-                    if UPLOAD_ENABLED and UPLOAD_AVAILABLE:
-                        print("Uploading image...")
-                        upload_captured_image(filepath)
+            if use_encode_worker:
+                # Take the frame now; the encoder thread writes the JPEG
+                try:
+                    request = _picam2.capture_request()
+                except Exception as e:
+                    print(f"✗ Capture failed: {e}")
+                    print("Capture failed. Ready to try again...")
+                    continue
+                encode_q.put((request, tmp_path, filepath))
+                print("Ready for next capture...")
+                continue
+            
+            captured, preview = capture_image_with_preview(tmp_path)
+            if captured:
+                # Hand off upload (if enabled) and the move to SAVE_DIR
+                queue_capture(work_q, tmp_path, filepath, preview, upload_active)
                 print("Ready for next capture...")
             else:
+                discard_capture(tmp_path)
                 print("Capture failed. Ready to try again...")
             
-            # Small delay to prevent multiple captures from button bounce
-            time.sleep(0.5)
-            
     except KeyboardInterrupt:
         print("\n\nShutting down...")
     finally:
+        # Let queued requests finish encoding before their buffers go away
+        if use_encode_worker:
+            encode_q.join()
+        stop_camera()
+        # Let the storage worker finish what it has before touching its files
+        drained = wait_queue(work_q, SHUTDOWN_UPLOAD_WAIT)
+        if not drained:
+            skipped = 0
+            while True:
+                try:
+                    tmp_path, final_path, _ = work_q.get_nowait()
+                except queue.Empty:
+                    break
+                persist_capture(tmp_path, final_path)
+                work_q.task_done()
+                skipped += 1
+            if skipped:
+                print(f"⚠ {skipped} queued upload(s) skipped at exit (saved to {SAVE_DIR})")
+            # Only the capture the worker is on now remains
+            drained = wait_queue(work_q, UPLOAD_TIMEOUT)
+        # Don't leave staged captures behind in RAM (rpicam_* files are
+        # signal-mode temporaries, not captures)
+        if capture_dir != SAVE_DIR:
+            if drained:
+                for name in os.listdir(capture_dir):
+                    if name.startswith("capture_"):
+                        persist_capture(os.path.join(capture_dir, name), os.path.join(SAVE_DIR, name))
+            else:
+                print(f"⚠ Storage worker still busy, staged captures left in {capture_dir}")
         print("Done!")
 
 
 if __name__ == "__main__":
-    import sys
-    
     # Show usage if help requested
     if len(sys.argv) > 1 and sys.argv[1] in ['--help', '-h', 'help']:
         print("Button Camera Capture")
@@ -21,10 +21,15 @@ SAVE_DIR = "~/pictures"  # Directory to save images
 # "~/captures"           # Custom folder
 # "/media/usb/captures"  # USB drive
 # "/tmp/captures"        # Temporary (cleared on reboot)
+# Avoid filesystems mounted with the "sync" option: every JPEG write then blocks
+# on the SD card. A normal (async) mount or tmpfs (/tmp) lets the kernel batch writes.
+
+SYNC_INTERVAL = 0  # Seconds between background os.sync() calls (0 = leave writeback to the kernel)
 
 # Camera Settings
 WARMUP_TIME = 2  # Seconds to wait for camera warmup
 IMAGE_FORMAT = "jpeg"  # Image format (jpeg or png)
+HARDWARE_JPEG = False  # Encode on the VideoCore JPEG block instead of the CPU (picamera2 only, ignored with UPLOAD_LORES)
 
 # Button Settings
 BUTTON_DEBOUNCE = 0.5  # Seconds to wait between captures (prevents double-press)
@@ -36,4 +41,7 @@ UPLOAD_SERVER_URL = "https://662a630e-2600-4c96-bdad-c6c625b41c0e-00-13s949ql9ao
 # Replit URL format: "https://your-repl-name.replit.app" or your deployment URL
 UPLOAD_MAX_SIZE_MB = 20  # Maximum file size in MB (Pi Zero 2W optimized, Replit allows 50MB)
 UPLOAD_TIMEOUT = 30  # Upload timeout in seconds
+UPLOAD_RESIZE = None  # Downscale before upload to fit (width, height), e.g. (1280, 720); None uploads the original
+UPLOAD_QUALITY = 75  # JPEG quality used when UPLOAD_RESIZE or UPLOAD_LORES is set
+UPLOAD_LORES = None  # e.g. (640, 480): upload a second low-res stream produced by the ISP in the same frame (needs picamera2 + PyTurboJPEG)
 
@@ -4,30 +4,94 @@ Camera image capture module for Raspberry Pi wearable pin.
 Supports Arducam 5MP OV5647, Arducam 16MP IMX519, and standard Raspberry Pi cameras.
 """
 
+import atexit
+import ctypes
+import ctypes.util
+import importlib.util
+import itertools
 import os
 import sys
+import threading
 import time
 from datetime import datetime
-from pathlib import Path
 
+# glibc malloc tuning. libcamera and picamera2 start several threads and glibc
+# gives each its own arena, which keeps freed frame-sized chunks instead of
+# returning them to the OS. MALLOC_ARENA_MAX in the environment only takes
+# effect at process start, so the same limit is applied with mallopt() here,
+# before any camera threads exist.
+_M_ARENA_MAX = -8
+MALLOC_ARENA_MAX = 2
 try:
-    from picamera2 import Picamera2
-    PICAMERA_AVAILABLE = True
-except ImportError:
-    PICAMERA_AVAILABLE = False
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+    _libc.mallopt(_M_ARENA_MAX, MALLOC_ARENA_MAX)
+except (OSError, AttributeError):
+    _libc = None  # Not glibc
+
+
+def trim_heap():
+    """Return free memory at the top of the malloc heaps to the OS (glibc only)."""
+    if _libc is not None:
+        try:
+            _libc.malloc_trim(0)
+        except AttributeError:
+            pass
+
+
+# picamera2 is only imported in CameraCapture.initialize(), keeping imports of
+# this module (e.g. from check_environment.py) cheap
+PICAMERA_AVAILABLE = importlib.util.find_spec("picamera2") is not None
+if not PICAMERA_AVAILABLE:
     print("Warning: picamera2 not available. Using mock mode.")
 
 import config
+from sysinfo import drop_page_cache
+
+
+class _FirstFrameWriter:
+    """File-like sink for picamera2's FileOutput that keeps only the first encoded frame."""
+    
+    def __init__(self, filepath):
+        self._filepath = filepath
+        self.done = threading.Event()
+    
+    def write(self, data):
+        if not self.done.is_set():
+            with open(self._filepath, 'wb', buffering=0) as f:
+                f.write(data)
+                drop_page_cache(f)
+            self.done.set()
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        pass
 
 
 class CameraCapture:
     """Handle camera operations for capturing images."""
     
-    def __init__(self):
-        """Initialize the camera capture system."""
+    def __init__(self, verbose=True):
+        """
+        Initialize the camera capture system.
+        
+        Args:
+            verbose: Print a message for every capture (callers that report
+                results themselves can turn this off)
+        """
         self.camera = None
+        self.verbose = verbose
         self.is_mock = not PICAMERA_AVAILABLE
         self.camera_type = config.CAMERA_TYPE
+        self.last_file_size = None  # Size in bytes of the most recent capture
+        # Default filenames: one timestamp per instance plus a sequence number
+        self._session_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._counter = itertools.count()
+        # Image directory resolved once; each capture is then a plain string concat
+        self._image_prefix = os.path.join(os.path.abspath(config.IMAGE_DIR), "")
+        self._image_dir_ready = False  # IMAGE_DIR is created on the first capture into it
+        self._write_image = None  # Capture-and-encode function, chosen in initialize()
         
     def _detect_camera_type(self):
         """Detect camera type automatically."""
@@ -48,25 +112,46 @@ class CameraCapture:
                 return 'standard'
         return self.camera_type
         
-    def initialize(self):
-        """Initialize the camera hardware."""
+    def initialize(self, resolution=None, lores_size=None, hardware_jpeg=None, quality=None):
+        """
+        Initialize the camera hardware.
+        
+        The buffer_count passed to create_still_configuration trades RAM for
+        robustness against dropped frames: 1 buffer for 16MP stills (each
+        buffer is large on a 512MB Pi Zero 2W), 2 for the 5MP/standard camera.
+        
+        Args:
+            resolution: Optional (width, height) override for config.CAMERA_RESOLUTION
+            lores_size: Optional (width, height) of a second YUV420 "lores" stream
+            hardware_jpeg: Encode on the VideoCore JPEG block (default: config.HARDWARE_JPEG)
+            quality: JPEG quality 1-100 for the hardware encoder (default: config.IMAGE_QUALITY)
+        """
+        self.hardware_jpeg = config.HARDWARE_JPEG if hardware_jpeg is None else hardware_jpeg
+        self.quality = config.IMAGE_QUALITY if quality is None else quality
         if self.is_mock:
             print("Running in mock mode - no actual camera access")
             return True
             
         try:
             # Initialize camera
+            from picamera2 import Picamera2
             self.camera = Picamera2()
             
             # Detect camera type if auto
             detected_type = self._detect_camera_type()
             
+            if resolution is None:
+                resolution = config.CAMERA_RESOLUTION
+            streams = {}
+            if lores_size:
+                streams["lores"] = {"size": tuple(lores_size), "format": "YUV420"}
+            
             if detected_type == 'arducam_16mp':
                 print("Detected Arducam 16MP IMX519 camera")
                 # Arducam 16MP IMX519 configuration
                 # Max resolution: 4656 x 3496
                 # Ensure resolution doesn't exceed camera capabilities
-                width, height = config.CAMERA_RESOLUTION
+                width, height = resolution
                 if width > 4656:
                     width = 4656
                 if height > 3496:
@@ -74,17 +159,21 @@ class CameraCapture:
                 resolution = (width, height)
                 
                 # Create configuration optimized for Arducam
+                # YUV420 is 1.5 bytes/pixel vs 3 for RGB888 (~23MB vs ~47MB
+                # per 16MP frame) and is fed to the JPEG encoder as-is
                 camera_config = self.camera.create_still_configuration(
                     main={
                         "size": resolution,
-                        "format": "RGB888"
-                    }
+                        "format": "YUV420"
+                    },
+                    buffer_count=1,  # A single 16MP buffer; a second would cost another ~23MB
+                    **streams
                 )
             else:
                 # Standard Pi camera or Arducam OV5647 configuration
                 # OV5647 max resolution: 2592 x 1944 (5MP)
                 # Ensure resolution doesn't exceed camera capabilities
-                width, height = config.CAMERA_RESOLUTION
+                width, height = resolution
                 if width > 2592:
                     width = 2592
                 if height > 1944:
@@ -96,14 +185,22 @@ class CameraCapture:
                 camera_config = self.camera.create_still_configuration(
                     main={
                         "size": resolution,
-                        "format": "RGB888"
-                    }
+                        "format": "YUV420"
+                    },
+                    buffer_count=2,  # Two 5MP buffers avoid stalls between captures
+                    **streams
                 )
             
             # Configure camera
             self.camera.configure(camera_config)
             
             # Set camera controls
+            try:
+                # Skip the denoise pass: one less full-frame filter per capture
+                self.camera.set_controls({"NoiseReductionMode": 0})
+            except Exception as e:
+                print(f"Note: Noise reduction control not available: {e}")
+            
             if detected_type == 'arducam_16mp':
                 # Arducam-specific settings
                 # Optimized for Pi Zero 2W (512MB RAM) - use conservative settings
@@ -116,6 +213,9 @@ class CameraCapture:
                     # Some controls may not be available, continue anyway
                     print(f"Note: Some camera controls not available: {e}")
             
+            # Pick the encode path once rather than re-checking config per capture
+            self._write_image = self._make_image_writer()
+            
             # Start camera
             self.camera.start()
             
@@ -125,7 +225,7 @@ class CameraCapture:
             time.sleep(warmup_time)
             
             print(f"Camera initialized successfully ({detected_type})")
-            print(f"Resolution: {config.CAMERA_RESOLUTION}")
+            print(f"Resolution: {resolution}")
             return True
         except Exception as e:
             print(f"Error initializing camera: {e}")
@@ -142,21 +242,30 @@ class CameraCapture:
         Capture an image and save it to disk.
         
         Args:
-            filename: Optional custom filename. If None, generates timestamp-based name.
+            filename: Optional custom filename (relative to IMAGE_DIR) or
+                absolute path. If None, generates a session-timestamp +
+                sequence-number name.
             
         Returns:
             Path to the saved image file, or None if capture failed.
         """
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"capture_{timestamp}.{config.IMAGE_FORMAT}"
+            filename = f"capture_{self._session_prefix}_{next(self._counter):05d}.{config.IMAGE_FORMAT}"
         
-        filepath = os.path.join(config.IMAGE_DIR, filename)
+        if os.path.isabs(filename):
+            filepath = filename
+        else:
+            filepath = self._image_prefix + filename
+            if not self._image_dir_ready:
+                config.ensure_dirs()
+                self._image_dir_ready = True
         
         if self.is_mock:
             # Create a mock file for testing
-            Path(filepath).touch()
-            print(f"Mock image captured: {filepath}")
+            open(filepath, 'ab').close()
+            self.last_file_size = 0
+            if self.verbose:
+                print(f"Mock image captured: {filepath}")
             return filepath
         
         try:
@@ -165,21 +274,22 @@ class CameraCapture:
                 time.sleep(config.CAPTURE_DELAY)
             
             # Capture image
-            # For Pi Zero 2W with 16MP, capture_file is more memory-efficient than capture_array
-            self.camera.capture_file(filepath)
+            self._write_image(filepath)
             
-            # Verify file was created and has content
-            if os.path.exists(filepath):
-                file_size = os.path.getsize(filepath)
-                if file_size > 0:
+            # Verify file was created and has content (one stat call)
+            try:
+                file_size = os.stat(filepath).st_size
+            except FileNotFoundError:
+                print(f"Error: Captured file was not created")
+                return None
+            if file_size > 0:
+                self.last_file_size = file_size
+                if self.verbose:
                     print(f"Image captured successfully: {filepath}")
                     print(f"File size: {file_size / (1024*1024):.2f} MB")
-                    return filepath
-                else:
-                    print(f"Error: Captured file is empty")
-                    return None
+                return filepath
             else:
-                print(f"Error: Captured file was not created")
+                print(f"Error: Captured file is empty")
                 return None
         except MemoryError:
             print("Error: Out of memory during capture")
@@ -189,6 +299,61 @@ class CameraCapture:
             print(f"Error capturing image: {e}")
             return None
     
+    def _make_image_writer(self):
+        """
+        Build the capture-and-encode function used by capture_image().
+        
+        Returns:
+            Callable taking the output filepath
+        """
+        if self.hardware_jpeg:
+            return self._capture_hardware_jpeg
+        
+        capture_request = self.camera.capture_request
+        image_format = config.IMAGE_FORMAT
+        
+        def write_image(filepath):
+            # Borrow one of the buffers allocated at configure() time (buffer_count)
+            # and hand it straight back, rather than capture_array-style copies
+            request = capture_request()
+            try:
+                # Unbuffered: the encoded JPEG goes straight to the kernel,
+                # then its pages are dropped so captures don't fill the page cache
+                with open(filepath, 'wb', buffering=0) as f:
+                    request.save("main", f, format=image_format)
+                    drop_page_cache(f)
+            finally:
+                request.release()
+        
+        return write_image
+    
+    def _capture_hardware_jpeg(self, filepath, timeout=5):
+        """
+        Encode the next frame with the VideoCore JPEG block (V4L2 M2M) instead of the CPU.
+        
+        The encoder reads libcamera's dmabuf directly, so the frame is never
+        copied into userspace. Requires a YUV420 main stream.
+        """
+        from picamera2.encoders import MJPEGEncoder, Quality
+        from picamera2.outputs import FileOutput
+        
+        if self.quality >= 90:
+            quality = Quality.VERY_HIGH
+        elif self.quality >= 75:
+            quality = Quality.HIGH
+        elif self.quality >= 50:
+            quality = Quality.MEDIUM
+        else:
+            quality = Quality.LOW
+        
+        writer = _FirstFrameWriter(filepath)
+        self.camera.start_encoder(MJPEGEncoder(), FileOutput(writer), quality=quality)
+        try:
+            if not writer.done.wait(timeout):
+                raise TimeoutError("hardware JPEG encoder produced no frame")
+        finally:
+            self.camera.stop_encoder()
+    
     def cleanup(self):
         """Clean up camera resources."""
         if self.camera and not self.is_mock:
@@ -200,6 +365,44 @@ class CameraCapture:
                 print(f"Error cleaning up camera: {e}")
 
 
+# Shared camera instance: libcamera allows only one owner per sensor, so scripts
+# that capture from several places go through get_camera() instead of
+# constructing their own CameraCapture
+_instance = None
+
+
+def get_camera(resolution=None, lores_size=None, hardware_jpeg=None, quality=None):
+    """
+    Return the shared, initialized CameraCapture, creating it on first use.
+    
+    Args:
+        resolution: Optional (width, height), only used when first created
+        lores_size: Optional lores stream size, only used when first created
+        hardware_jpeg: Optional encode-path override, only used when first created
+        quality: Optional hardware JPEG quality, only used when first created
+    
+    Returns:
+        CameraCapture instance, or None if initialization failed
+    """
+    global _instance
+    if _instance is None:
+        camera = CameraCapture()
+        if not camera.initialize(resolution=resolution, lores_size=lores_size,
+                                 hardware_jpeg=hardware_jpeg, quality=quality):
+            return None
+        _instance = camera
+        atexit.register(release_camera)
+    return _instance
+
+
+def release_camera():
+    """Clean up the shared camera instance, if any."""
+    global _instance
+    if _instance is not None:
+        _instance.cleanup()
+        _instance = None
+
+
 def main():
     """Main function for command-line usage."""
     import argparse
@@ -232,8 +435,7 @@ Examples:
     
     # Override config if command-line arguments provided
     if args.directory:
-        config.IMAGE_DIR = os.path.expanduser(args.directory)
-        os.makedirs(config.IMAGE_DIR, exist_ok=True)
+        config.IMAGE_DIR = os.path.abspath(os.path.expanduser(args.directory))
     
     if args.resolution:
         config.CAMERA_RESOLUTION = tuple(args.resolution)
@@ -257,7 +459,8 @@ Examples:
     else:
         print("Raspberry Pi Camera Capture (Arducam 5MP OV5647)")
     
-    camera = CameraCapture()
+    # The summary below already reports the file, so per-capture output is verbose-only
+    camera = CameraCapture(verbose=args.verbose)
     
     if not camera.initialize():
         print("Failed to initialize camera")
@@ -268,7 +471,7 @@ Examples:
         image_path = camera.capture_image(args.output)
         
         if image_path:
-            file_size = os.path.getsize(image_path)
+            file_size = camera.last_file_size
             file_size_mb = file_size / (1024 * 1024)
             print(f"\n✓ Image captured successfully!")
             print(f"  File: {image_path}")
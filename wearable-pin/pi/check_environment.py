@@ -4,12 +4,39 @@ Environment check script for Raspberry Pi Zero 2W with Arducam 5MP OV5647.
 Verifies system compatibility, camera detection, and configuration.
 """
 
+import functools
+import glob
+import json
 import os
+import re
 import sys
 import platform
 import subprocess
 from pathlib import Path
 
+from sysinfo import boot_id, disk_free_bytes, read_meminfo, read_throttle_state, run_cached
+
+# Seconds probe results are reused between runs (camera hardware doesn't hot-swap);
+# main() sets USE_PROBE_CACHE = False for --no-cache
+VCGENCMD_TTL = 30
+LIBCAMERA_TTL = 300
+USE_PROBE_CACHE = True
+
+# Written when every check passes; lets later runs in the same boot skip the
+# checks that can't change until a reboot
+ENV_STAMP_FILE = os.path.expanduser('~/.cache/wearable-pin/env-ok.json')
+
+# Tokens looked for in /proc/device-tree/model and /etc/os-release (one scan per file)
+_MODEL_RE = re.compile(rb'Zero 2|Raspberry Pi')
+_OS_RE = re.compile(rb'Raspbian|Raspberry Pi OS|Debian')
+_VERSION_ID_RE = re.compile(rb'^VERSION_ID="?([^"\n]+)"?', re.M)
+
+@functools.lru_cache(maxsize=None)
+def _read_file(path):
+    """Read a small system file once; its contents can't change while the script runs."""
+    with open(path, 'rb') as f:
+        return f.read()
+
 def check_pi_model():
     """Check Raspberry Pi model."""
     print("\n" + "=" * 50)
@@ -17,19 +44,20 @@ def check_pi_model():
     print("=" * 50)
     
     try:
-        with open('/proc/device-tree/model', 'r') as f:
-            model = f.read().strip()
-            print(f"✓ Detected: {model}")
-            
-            if 'Zero 2' in model or 'Zero 2 W' in model:
-                print("✓ Raspberry Pi Zero 2W detected - Compatible")
-                return True, model
-            elif 'Raspberry Pi' in model:
-                print("✓ Raspberry Pi detected - Compatible")
-                return True, model
-            else:
-                print("⚠ Unknown model - May still work")
-                return True, model
+        raw = _read_file('/proc/device-tree/model')
+        model = raw.decode(errors='replace').strip('\x00 \n')
+        tokens = set(_MODEL_RE.findall(raw))
+        print(f"✓ Detected: {model}")
+        
+        if b'Zero 2' in tokens:
+            print("✓ Raspberry Pi Zero 2W detected - Compatible")
+            return True, model
+        elif b'Raspberry Pi' in tokens:
+            print("✓ Raspberry Pi detected - Compatible")
+            return True, model
+        else:
+            print("⚠ Unknown model - May still work")
+            return True, model
     except FileNotFoundError:
         print("✗ Not running on Raspberry Pi")
         return False, "Unknown"
@@ -41,26 +69,26 @@ def check_os_version():
     print("=" * 50)
     
     try:
-        with open('/etc/os-release', 'r') as f:
-            os_info = f.read()
-            
-        if 'Raspbian' in os_info:
+        raw = _read_file('/etc/os-release')
+        tokens = set(_OS_RE.findall(raw))
+        
+        if b'Raspbian' in tokens:
             print("✗ Raspbian detected")
             print("  ERROR: Arducam 16MP requires Raspberry Pi OS (not Raspbian)")
             print("  Please upgrade to Raspberry Pi OS")
             return False
-        elif 'Raspberry Pi OS' in os_info or 'Debian' in os_info:
+        elif b'Raspberry Pi OS' in tokens or b'Debian' in tokens:
             print("✓ Raspberry Pi OS detected - Compatible with Arducam")
             
             # Check version
-            for line in os_info.split('\n'):
-                if 'VERSION_ID=' in line:
-                    version = line.split('=')[1].strip('"')
-                    print(f"  Version: {version}")
-                    if int(version.split('.')[0]) >= 11:  # Bullseye or later
-                        print("✓ OS version compatible (Bullseye or later)")
-                    else:
-                        print("⚠ OS version may be too old (recommend Bullseye or later)")
+            match = _VERSION_ID_RE.search(raw)
+            if match:
+                version = match.group(1).decode()
+                print(f"  Version: {version}")
+                if int(version.split('.')[0]) >= 11:  # Bullseye or later
+                    print("✓ OS version compatible (Bullseye or later)")
+                else:
+                    print("⚠ OS version may be too old (recommend Bullseye or later)")
             return True
         else:
             print("⚠ Unknown OS - May still work")
@@ -69,15 +97,51 @@ def check_os_version():
         print("⚠ Cannot read OS info")
         return True
 
+# Sensor driver names as they appear in /sys/class/video4linux/*/name
+_SENSOR_NAMES = {
+    'imx519': "Arducam 16MP IMX519",
+    'ov5647': "Arducam 5MP OV5647 / Pi Camera v1",
+    'imx219': "Pi Camera v2 (IMX219)",
+    'imx708': "Pi Camera Module 3 (IMX708)",
+    'imx477': "Pi HQ Camera (IMX477)",
+}
+
+def probe_sysfs_camera():
+    """
+    Look for a camera sensor in sysfs (no subprocess, no libcamera start-up).
+    
+    Returns:
+        tuple: (driver, description) of the first known sensor, or None
+    """
+    for path in sorted(glob.glob('/sys/class/video4linux/*/name')):
+        try:
+            with open(path, 'r') as f:
+                name = f.read().strip().lower()
+        except OSError:
+            continue
+        # Sensor subdevices are named "<driver> <i2c-bus>-<addr>", e.g. "ov5647 10-0036"
+        driver = name.split(' ', 1)[0]
+        if driver in _SENSOR_NAMES:
+            return driver, _SENSOR_NAMES[driver]
+    return None
+
 def check_camera_interface():
     """Check if camera interface is enabled."""
     print("\n" + "=" * 50)
     print("Camera Interface Check")
     print("=" * 50)
     
+    # A sensor bound to its kernel driver answers the question without spawning anything
+    sensor = probe_sysfs_camera()
+    if sensor is not None:
+        driver, description = sensor
+        print(f"  Sensor driver: {driver}")
+        print(f"✓ Camera interface enabled and camera detected ({description})")
+        return True
+    
     try:
-        result = subprocess.run(['vcgencmd', 'get_camera'], 
-                              capture_output=True, text=True, timeout=5)
+        result = run_cached(['vcgencmd', 'get_camera'],
+                            VCGENCMD_TTL if USE_PROBE_CACHE else 0, timeout=5)
         if result.returncode == 0:
             output = result.stdout.strip()
             print(f"  {output}")
@@ -108,8 +172,8 @@ def check_camera_libcamera():
     print("=" * 50)
     
     try:
-        result = subprocess.run(['libcamera-hello', '--list-cameras'], 
-                              capture_output=True, text=True, timeout=10)
+        result = run_cached(['libcamera-hello', '--list-cameras'],
+                            LIBCAMERA_TTL if USE_PROBE_CACHE else 0, timeout=10)
         if result.returncode == 0:
             output = result.stdout
             print("  Camera list:")
@@ -171,30 +235,25 @@ def check_system_resources():
     
     # Check memory
     try:
-        with open('/proc/meminfo', 'r') as f:
-            meminfo = f.read()
-            for line in meminfo.split('\n'):
-                if 'MemTotal:' in line:
-                    mem_kb = int(line.split()[1])
-                    mem_mb = mem_kb // 1024
-                    print(f"  Total RAM: {mem_mb} MB")
-                    
-                    if mem_mb < 512:
-                        print("⚠ Low memory - Pi Zero 2W has 512MB")
-                        print("  Consider using lower resolution for 16MP captures")
-                    elif mem_mb == 512:
-                        print("✓ Pi Zero 2W (512MB) - Compatible")
-                        print("  Note: 16MP images (~25MB) may use significant memory")
-                    else:
-                        print("✓ Sufficient memory")
-                    break
-    except:
+        mem_kb = read_meminfo().get('MemTotal')
+        if mem_kb is not None:
+            mem_mb = mem_kb // 1024
+            print(f"  Total RAM: {mem_mb} MB")
+            
+            if mem_mb < 512:
+                print("⚠ Low memory - Pi Zero 2W has 512MB")
+                print("  Consider using lower resolution for 16MP captures")
+            elif mem_mb == 512:
+                print("✓ Pi Zero 2W (512MB) - Compatible")
+                print("  Note: 16MP images (~25MB) may use significant memory")
+            else:
+                print("✓ Sufficient memory")
+    except (OSError, ValueError):
         print("⚠ Cannot read memory info")
     
     # Check disk space
     try:
-        stat = os.statvfs(os.path.expanduser('~'))
-        free_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
+        free_gb = disk_free_bytes() / (1024**3)
         print(f"  Free disk space: {free_gb:.2f} GB")
         
         if free_gb < 1:
@@ -203,8 +262,30 @@ def check_system_resources():
             print("  OV5647 1080p images: ~1-2MB each")
         else:
             print("✓ Sufficient disk space")
-    except:
+    except (OSError, ValueError):
         print("⚠ Cannot check disk space")
+    
+    # Throttling (recorded by throttle_poller.py, so no vcgencmd fork here)
+    throttled = read_throttle_state()
+    if throttled is None:
+        print("  Throttle state: unknown (throttle-poller.service not running)")
+    elif throttled & 0xF:
+        print(f"⚠ Currently throttled or under-voltage (0x{throttled:x})")
+        print("  Check the power supply and cooling")
+    elif throttled:
+        print(f"⚠ Throttling or under-voltage occurred since boot (0x{throttled:x})")
+    else:
+        print("✓ No throttling or under-voltage")
+
+# Messages for the well-known sensor resolutions, looked up by (width, height)
+_RES_TABLE = {
+    (4656, 3496): ("⚠ Full 16MP resolution (4656x3496) - for IMX519 only",
+                   "  Pi Zero 2W can handle this but may be slower"),
+    (2592, 1944): ("✓ Full 5MP resolution (2592x1944) - for OV5647",
+                   "  Good quality, moderate speed"),
+    (1920, 1080): ("✓ 1080p resolution (1920x1080) - recommended for OV5647",
+                   "  Good balance of quality and speed"),
+}
 
 def check_configuration():
     """Check configuration settings."""
@@ -221,24 +302,22 @@ def check_configuration():
         print(f"  Image Quality: {config.IMAGE_QUALITY}")
         print(f"  Image Directory: {config.IMAGE_DIR}")
         
-        # Check if image directory exists
-        if os.path.exists(config.IMAGE_DIR):
+        # Make sure the image directory exists (one mkdir covers both cases,
+        # and its result says which one happened - no separate stat)
+        try:
+            os.makedirs(config.IMAGE_DIR)
+            print(f"✓ Image directory created: {config.IMAGE_DIR}")
+        except FileExistsError:
             print(f"✓ Image directory exists: {config.IMAGE_DIR}")
-        else:
-            print(f"⚠ Image directory does not exist: {config.IMAGE_DIR}")
-            print("  Will be created automatically")
+        except OSError as e:
+            print(f"⚠ Cannot create image directory {config.IMAGE_DIR}: {e}")
         
         # Check resolution for camera type
         width, height = config.CAMERA_RESOLUTION
-        if width == 4656 and height == 3496:
-            print("⚠ Full 16MP resolution (4656x3496) - for IMX519 only")
-            print("  Pi Zero 2W can handle this but may be slower")
-        elif width == 2592 and height == 1944:
-            print("✓ Full 5MP resolution (2592x1944) - for OV5647")
-            print("  Good quality, moderate speed")
-        elif width == 1920 and height == 1080:
-            print("✓ 1080p resolution (1920x1080) - recommended for OV5647")
-            print("  Good balance of quality and speed")
+        known = _RES_TABLE.get((width, height))
+        if known is not None:
+            for line in known:
+                print(line)
         elif width <= 1920 and height <= 1080:
             print("✓ Resolution appropriate for Pi Zero 2W and OV5647")
         else:
@@ -277,24 +356,75 @@ def check_camera_initialization():
         traceback.print_exc()
         return False
 
+# Checks whose result can't change without a reboot. Packages and config.py can
+# be changed at any time, so those checks always run.
+BOOT_INVARIANT_CHECKS = ('Pi Model', 'OS Version', 'Camera Interface')
+
+def load_env_stamp():
+    """
+    Read the results of a passing run from earlier in this boot.
+    
+    Returns:
+        dict: Check name to result, or None if there is no stamp for this boot
+    """
+    current = boot_id()
+    if current is None:
+        return None
+    try:
+        with open(ENV_STAMP_FILE, 'r') as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stamp.get('boot_id') != current:
+        return None
+    return stamp.get('checks')
+
+def save_env_stamp(results):
+    """Record passing check results against the current boot ID."""
+    current = boot_id()
+    if current is None:
+        return
+    checks = {name: result for name, result in results.items() if name in BOOT_INVARIANT_CHECKS}
+    try:
+        os.makedirs(os.path.dirname(ENV_STAMP_FILE), exist_ok=True)
+        with open(ENV_STAMP_FILE, 'w') as f:
+            json.dump({'boot_id': current, 'checks': checks}, f)
+    except OSError:
+        pass  # The stamp is only an optimization
+
 def main():
     """Run all environment checks."""
+    global USE_PROBE_CACHE
+    
+    # --no-cache forces the camera probes to run again
+    if '--no-cache' in sys.argv:
+        USE_PROBE_CACHE = False
+    
     print("\n" + "=" * 50)
     print("Raspberry Pi Zero 2W + Arducam 16MP Environment Check")
     print("=" * 50)
     
-    results = {}
-    
-    # Run checks
-    pi_ok, model = check_pi_model()
-    results['Pi Model'] = pi_ok
-    
-    os_ok = check_os_version()
-    results['OS Version'] = os_ok
-    
-    camera_interface_ok = check_camera_interface()
-    if camera_interface_ok is not None:
-        results['Camera Interface'] = camera_interface_ok
+    # Hardware, OS and camera interface don't change within a boot, so after a
+    # passing run only those are taken from the stamp
+    stamped = load_env_stamp() if USE_PROBE_CACHE else None
+    if stamped is not None:
+        print("\n✓ Hardware checks already passed this boot (use --no-cache to re-run them)")
+        results = dict(stamped)
+        pi_ok = results.get('Pi Model', False)
+        os_ok = results.get('OS Version', False)
+    else:
+        results = {}
+        
+        # Run checks
+        pi_ok, model = check_pi_model()
+        results['Pi Model'] = pi_ok
+        
+        os_ok = check_os_version()
+        results['OS Version'] = os_ok
+        
+        camera_interface_ok = check_camera_interface()
+        if camera_interface_ok is not None:
+            results['Camera Interface'] = camera_interface_ok
     
     packages_ok = check_python_packages()
     results['Python Packages'] = packages_ok
@@ -328,6 +458,8 @@ def main():
     all_passed = all(r for r in results.values() if r is not None)
     
     if all_passed:
+        if stamped is None:
+            save_env_stamp(results)
         print("\n✓ All checks passed! Environment is ready for camera capture.")
         return 0
     else:
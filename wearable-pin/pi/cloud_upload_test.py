@@ -8,15 +8,32 @@ Uploads files to a remote server using HTTP POST requests
 Usage:
     python3 cloud_upload_test.py /path/to/file.jpg
     python3 cloud_upload_test.py /path/to/file.jpg --server http://192.168.1.100:5001
+
+From other scripts, call the functions directly instead of main():
+    from cloud_upload_test import upload_file
+    upload_file('/path/to/file.jpg', 'http://192.168.1.100:5001')
 """
 
 import sys
 import os
+import socket
+import io
+import mmap
+import hashlib
+import http.client
+import json
+import zlib
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from pathlib import Path
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -25,6 +42,13 @@ except ImportError:
     print("Or on Raspberry Pi: sudo pip3 install requests")
     sys.exit(1)
 
+try:
+    from requests_toolbelt import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    # Fall back to requests' built-in multipart encoding (buffers the whole body)
+    TOOLBELT_AVAILABLE = False
+
 
 # Default server configuration
 DEFAULT_SERVER_URL = "https://662a630e-2600-4c96-bdad-c6c625b41c0e-00-13s949ql9aoor.janeway.replit.dev:3000"  # Replit deployment URL
@@ -33,56 +57,121 @@ DEFAULT_UPLOAD_ENDPOINT = "/api/upload"
 DEFAULT_MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB in bytes (CLI default)
 DEFAULT_MAX_FILE_SIZE_PI_ZERO = 20 * 1024 * 1024  # 20MB for Pi Zero 2W
 
+# Leading bytes of formats that are already compressed (never gzipped again)
+_COMPRESSED_MAGIC = (
+    b'\xff\xd8\xff',  # JPEG
+    b'\x89PNG',        # PNG
+    b'\x1f\x8b',       # gzip
+)
+
+# Shared keep-alive session (see get_session())
+_session = None
+
+# Chunk size for multipart bodies streamed without requests-toolbelt (see _MultipartBody)
+STREAM_CHUNK_SIZE = 128 * 1024
+
+# Chunk size for raw HTTPS uploads, read into one reusable buffer (see upload_file_raw())
+RAW_CHUNK_SIZE = 1024 * 1024
 
-def check_memory(min_free_mb=100):
+# Concurrent DELETEs for bulk cleanup (delete_many()); one pooled connection each
+DELETE_WORKERS = 8
+
+
+def file_sha256(fileobj):
     """
-    Check available system memory.
+    Hash an open binary file with SHA-256, leaving it positioned at the start.
     
     Args:
-        min_free_mb: Minimum free memory in MB to consider safe (default: 100MB)
+        fileobj: File object opened in binary mode
     
     Returns:
-        dict: {'available': bool, 'free_mb': int, 'warning': str or None}
+        str: Hex digest
     """
-    try:
-        with open('/proc/meminfo', 'r') as f:
-            meminfo = f.read()
-            mem_available = None
-            for line in meminfo.split('\n'):
-                if 'MemAvailable:' in line:
-                    mem_available = int(line.split()[1])  # in KB
-                    break
-            
-            if mem_available is None:
-                # Fallback to MemFree if MemAvailable not available
-                for line in meminfo.split('\n'):
-                    if 'MemFree:' in line:
-                        mem_available = int(line.split()[1])
-                        break
-            
-            if mem_available is not None:
-                mem_available_mb = mem_available // 1024
-                warning = None
-                if mem_available_mb < min_free_mb:
-                    warning = f"Low memory: {mem_available_mb}MB free (recommended: {min_free_mb}MB+)"
-                
-                return {
-                    'available': mem_available_mb >= min_free_mb,
-                    'free_mb': mem_available_mb,
-                    'warning': warning
-                }
-    except Exception:
-        pass
+    if hasattr(hashlib, 'file_digest'):
+        # Python 3.11+: hashed in C with OpenSSL, no Python-level read loop
+        digest = hashlib.file_digest(fileobj, 'sha256').hexdigest()
+    else:
+        h = hashlib.sha256()
+        for chunk in iter(lambda: fileobj.read(65536), b''):
+            h.update(chunk)
+        digest = h.hexdigest()
+    fileobj.seek(0)
+    return digest
+
+
+def _gzip_stream(reader, chunk_size=65536):
+    """Yield a gzip-compressed copy of a readable stream (or iterable of chunks), chunk by chunk."""
+    # Level 1 keeps up with a cellular uplink on the Pi Zero 2W; wbits=31 writes a gzip container
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+    chunks = iter(lambda: reader.read(chunk_size), b'') if hasattr(reader, 'read') else reader
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+# Fixed SO_SNDBUF for upload sockets, in bytes (None: leave it to the kernel).
+# Off by default: Linux clamps the value to net.core.wmem_max (~208 KiB by
+# default) and setting it disables send-buffer autotuning, which can otherwise
+# grow to tcp_wmem[2] (4 MiB) on high-latency links. Only useful with wmem_max raised.
+UPLOAD_SNDBUF = None
+
+
+class _UploadAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections use UPLOAD_SNDBUF, if set."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        # urllib3's defaults already include TCP_NODELAY
+        if UPLOAD_SNDBUF:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_SNDBUF, UPLOAD_SNDBUF),
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session(pool_maxsize=2, retries=2):
+    """
+    Create a requests Session that keeps connections alive between uploads.
+    
+    Reusing the session avoids a new TCP + TLS handshake for every file.
     
-    # If we can't read memory info, assume it's okay
-    return {
-        'available': True,
-        'free_mb': None,
-        'warning': None
-    }
+    Args:
+        pool_maxsize: Maximum connections kept open per host (default: 2)
+        retries: Number of retries on connection errors (default: 2)
+    
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter = _UploadAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=0.5,
+                          status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
-def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, timeout=None, check_mem=True, verbose=True):
+def get_session():
+    """
+    Return the module's shared session, creating it on first use.
+    
+    Used by upload_file(), list_files() and delete_file() when no session is
+    passed, so consecutive calls reuse one keep-alive connection.
+    
+    Returns:
+        requests.Session: Shared session
+    """
+    global _session
+    if _session is None:
+        _session = create_session(pool_maxsize=4, retries=3)
+    return _session
+
+
+def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, timeout=None, verbose=True, session=None, compress=False):
     """
     Upload a file to the remote server.
     
@@ -92,8 +181,11 @@ def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, t
         endpoint: API endpoint path (default: DEFAULT_UPLOAD_ENDPOINT)
         max_file_size: Maximum file size in bytes (default: DEFAULT_MAX_FILE_SIZE)
         timeout: Upload timeout in seconds (default: 30)
-        check_mem: Whether to check available memory before upload (default: True)
         verbose: Whether to print progress messages (default: True)
+        session: Optional requests.Session to use (default: the shared session)
+        compress: Send the request body with Content-Encoding: gzip, unless
+            the file is already compressed (JPEG/PNG/gzip); the server must
+            accept gzip request bodies (default: False)
     
     Returns:
         dict: Response from server with status and message
@@ -110,9 +202,16 @@ def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, t
     if timeout is None:
         timeout = 30
     
+    sess = session if session is not None else get_session()
+    
     # Construct full URL
     upload_url = f"{server_url.rstrip('/')}{endpoint}"
     
+    return _upload_file(sess, upload_url, file_path, max_file_size, timeout, verbose, compress)
+
+
+def _upload_file(sess, upload_url, file_path, max_file_size, timeout, verbose, compress=False):
+    """Validate and upload a file to an already-built upload URL."""
     # Validate file exists
     file_path = Path(file_path)
     if not file_path.exists():
@@ -131,29 +230,151 @@ def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, t
             "error": f"File too large: {file_mb:.2f}MB (max: {max_mb:.2f}MB)"
         }
     
-    # Check memory if requested
-    if check_mem:
-        mem_check = check_memory(min_free_mb=100)
-        if mem_check['warning'] and verbose:
-            print(f"⚠ {mem_check['warning']}")
-        if not mem_check['available']:
-            return {
-                "success": False,
-                "error": f"Insufficient memory: {mem_check['free_mb']}MB free (need 100MB+)",
-                "hint": "Free up memory or reduce file size"
-            }
-    
     # Upload file
+    if verbose:
+        file_mb = file_size / (1024 * 1024)
+        print(f"Uploading {file_path.name} ({file_mb:.2f}MB)...")
+        print(f"Server: {upload_url}")
+    
     try:
-        if verbose:
-            file_mb = file_size / (1024 * 1024)
-            print(f"Uploading {file_path.name} ({file_mb:.2f}MB)...")
-            print(f"Server: {upload_url}")
-        
         with open(file_path, 'rb') as f:
-            # Replit format: simple filename without content-type
-            files = {'file': (os.path.basename(str(file_path)), f)}
-            response = requests.post(upload_url, files=files, timeout=timeout)
+            if hasattr(os, 'posix_fadvise'):
+                # Whole-file sequential read: start aggressive readahead now so
+                # the SD card reads overlap with hashing and the connection setup
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            digest = file_sha256(f)
+            if compress and f.read(4).startswith(_COMPRESSED_MAGIC):
+                compress = False  # Already compressed; gzip would only cost CPU
+            f.seek(0)
+            return _post_upload(sess, upload_url, file_path.name, f, timeout, digest, compress)
+    except OSError as e:
+        return {
+            "success": False,
+            "error": f"Upload error: {str(e)}"
+        }
+
+
+def upload_bytes(data, filename, server_url=None, endpoint=None, timeout=None, verbose=True, session=None):
+    """
+    Upload in-memory file contents (e.g. a re-encoded image) to the remote server.
+    
+    Args:
+        data: File contents as bytes
+        filename: Filename to report to the server
+        server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
+        endpoint: API endpoint path (default: DEFAULT_UPLOAD_ENDPOINT)
+        timeout: Upload timeout in seconds (default: 30)
+        verbose: Whether to print progress messages (default: True)
+        session: Optional requests.Session to use (default: the shared session)
+    
+    Returns:
+        dict: Response from server with status and message
+    """
+    if server_url is None:
+        server_url = DEFAULT_SERVER_URL
+    
+    if endpoint is None:
+        endpoint = DEFAULT_UPLOAD_ENDPOINT
+    
+    if timeout is None:
+        timeout = 30
+    
+    sess = session if session is not None else get_session()
+    upload_url = f"{server_url.rstrip('/')}{endpoint}"
+    
+    return _upload_bytes(sess, upload_url, data, filename, timeout, verbose)
+
+
+def _upload_bytes(sess, upload_url, data, filename, timeout, verbose):
+    """Upload in-memory file contents to an already-built upload URL."""
+    if verbose:
+        print(f"Uploading {filename} ({len(data) / (1024 * 1024):.2f}MB)...")
+        print(f"Server: {upload_url}")
+    
+    digest = hashlib.sha256(data).hexdigest()
+    return _post_upload(sess, upload_url, filename, io.BytesIO(data), timeout, digest)
+
+
+class _MultipartBody:
+    """
+    Streamed multipart/form-data body for a single file, without requests-toolbelt.
+    
+    The file is mmap'd and sent in STREAM_CHUNK_SIZE memoryview slices, so
+    pages come from the page cache straight into the socket writes and Python
+    never holds a copy of the file. len() gives requests the Content-Length.
+    """
+    
+    def __init__(self, filename, fileobj):
+        self.boundary = os.urandom(16).hex()
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self._head = (f'--{self.boundary}\r\n'
+                      f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                      f'\r\n').encode()
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self._map = None
+        if isinstance(fileobj, io.BytesIO):
+            self._view = fileobj.getbuffer()
+        elif os.fstat(fileobj.fileno()).st_size:
+            self._map = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+        else:
+            self._view = memoryview(b'')  # mmap can't map an empty file
+    
+    def __len__(self):
+        return len(self._head) + len(self._view) + len(self._tail)
+    
+    def __iter__(self):
+        yield self._head
+        for offset in range(0, len(self._view), STREAM_CHUNK_SIZE):
+            yield self._view[offset:offset + STREAM_CHUNK_SIZE]
+        yield self._tail
+    
+    def close(self):
+        """Release the view and unmap the file (call once the request is done)."""
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # A chunk is still referenced; unmapped when it's collected
+            self._map = None
+
+
+def _post_upload(sess, upload_url, filename, fileobj, timeout, digest, compress=False):
+    """POST a file object as multipart form data and translate the server response."""
+    # Lets the server verify the upload arrived intact
+    headers = {'X-Content-SHA256': digest}
+    multipart = None
+    try:
+        # Replit format: simple filename without content-type
+        if TOOLBELT_AVAILABLE:
+            # Stream the multipart body from disk in chunks instead of
+            # building it in memory (matters on the 512MB Pi Zero 2W)
+            encoder = MultipartEncoder(fields={'file': (filename, fileobj)})
+            headers['Content-Type'] = encoder.content_type
+            body = encoder
+            # Known length up front: sent with Content-Length, never chunked
+            headers['Content-Length'] = str(encoder.len)
+            if compress:
+                # Compressed on the fly and sent with chunked transfer encoding
+                headers['Content-Encoding'] = 'gzip'
+                del headers['Content-Length']
+                body = _gzip_stream(encoder)
+        else:
+            # Same streaming behaviour with the file mapped instead of read;
+            # requests sets Content-Length from len(body)
+            body = multipart = _MultipartBody(filename, fileobj)
+            headers['Content-Type'] = body.content_type
+            if compress:
+                headers['Content-Encoding'] = 'gzip'
+                body = _gzip_stream(body)
+        response = sess.post(
+            upload_url,
+            data=body,
+            headers=headers,
+            timeout=timeout
+        )
         
         # Check response - Replit returns JSON with success, filename, originalName, size, path
         if response.status_code == 200:
@@ -183,7 +404,7 @@ def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, t
             try:
                 error_data = response.json()
                 error_msg = error_data.get('error', f"Upload failed with status {response.status_code}")
-            except:
+            except (ValueError, AttributeError):
                 error_msg = f"Upload failed with status {response.status_code}"
             
             return {
@@ -209,15 +430,116 @@ def upload_file(file_path, server_url=None, endpoint=None, max_file_size=None, t
             "success": False,
             "error": f"Upload error: {str(e)}"
         }
+    finally:
+        if multipart is not None:
+            multipart.close()
+
+
+def upload_file_raw(file_path, server_url=None, endpoint=None, timeout=None, verbose=True):
+    """
+    Upload a file as a raw application/octet-stream PUT.
+    
+    Over plain http:// the file is sent with sendfile(2), going from the page
+    cache to the socket inside the kernel with no userspace copy. TLS has to
+    encrypt in userspace, so https:// uploads read the file into one reusable
+    RAW_CHUNK_SIZE buffer instead of allocating a new bytes object per chunk.
+    The server must accept a raw body; the filename is sent in the
+    X-Filename header.
+    
+    Args:
+        file_path: Path to the file to upload
+        server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
+        endpoint: API endpoint path (default: DEFAULT_UPLOAD_ENDPOINT)
+        timeout: Upload timeout in seconds (default: 30)
+        verbose: Whether to print progress messages (default: True)
+    
+    Returns:
+        dict: Response from server with status and message
+    """
+    if server_url is None:
+        server_url = DEFAULT_SERVER_URL
+    
+    if endpoint is None:
+        endpoint = DEFAULT_UPLOAD_ENDPOINT
+    
+    if timeout is None:
+        timeout = 30
+    
+    url = urlsplit(server_url)
+    if url.scheme == 'http':
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    elif url.scheme == 'https':
+        conn = http.client.HTTPSConnection(url.hostname, url.port or 443, timeout=timeout)
+    else:
+        return {
+            "success": False,
+            "error": f"Unsupported server URL scheme: {url.scheme}"
+        }
+    
+    file_path = Path(file_path)
+    upload_path = f"{url.path.rstrip('/')}{endpoint}"
+    try:
+        with open(file_path, 'rb', buffering=0) as f:
+            file_size = os.fstat(f.fileno()).st_size
+            digest = file_sha256(f)
+            if verbose:
+                print(f"Uploading {file_path.name} ({file_size / (1024 * 1024):.2f}MB, raw)...")
+                print(f"Server: {server_url.rstrip('/')}{endpoint}")
+            conn.putrequest('PUT', upload_path)
+            conn.putheader('Content-Type', 'application/octet-stream')
+            conn.putheader('Content-Length', str(file_size))
+            conn.putheader('X-Filename', file_path.name)
+            conn.putheader('X-Content-SHA256', digest)
+            conn.endheaders()
+            if url.scheme == 'http':
+                conn.sock.sendfile(f)
+            else:
+                buf = memoryview(bytearray(RAW_CHUNK_SIZE))
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    conn.sock.sendall(buf[:n])
+        
+        response = conn.getresponse()
+        body = response.read()
+        if response.status == 200:
+            try:
+                result = json.loads(body)
+            except ValueError:
+                result = body.decode(errors='replace')
+            return {
+                "success": True,
+                "message": "Upload successful",
+                "response": result
+            }
+        return {
+            "success": False,
+            "error": f"Upload failed with status {response.status}",
+            "response": body.decode(errors='replace')
+        }
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "error": f"File not found: {file_path}"
+        }
+    except (OSError, http.client.HTTPException) as e:
+        return {
+            "success": False,
+            "error": f"Upload error: {str(e)}"
+        }
+    finally:
+        conn.close()
 
 
-def list_files(server_url=None, endpoint=None):
+def list_files(server_url=None, endpoint=None, session=None):
     """
     Get list of uploaded files from the server.
     
     Args:
         server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
         endpoint: API endpoint path (default: "/api/files")
+        session: Optional requests.Session to use (default: the shared session)
     
     Returns:
         dict: Response from server with file list
@@ -229,10 +551,15 @@ def list_files(server_url=None, endpoint=None):
         endpoint = "/api/files"
     
     list_url = f"{server_url.rstrip('/')}{endpoint}"
-    
+    sess = session if session is not None else get_session()
+    return _list_files(sess, list_url)
+
+
+def _list_files(sess, list_url):
+    """Fetch the file list from an already-built URL."""
     try:
         print(f"Fetching file list from: {list_url}")
-        response = requests.get(list_url, timeout=10)
+        response = sess.get(list_url, timeout=10)
         
         if response.status_code == 200:
             try:
@@ -252,14 +579,14 @@ def list_files(server_url=None, endpoint=None):
                 "error": f"Failed to get file list: status {response.status_code}"
             }
     
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
         return {
             "success": False,
             "error": f"Error fetching file list: {str(e)}"
         }
 
 
-def delete_file(filename, server_url=None, endpoint=None):
+def delete_file(filename, server_url=None, endpoint=None, session=None):
     """
     Delete a file from the server.
     
@@ -267,6 +594,7 @@ def delete_file(filename, server_url=None, endpoint=None):
         filename: Name of the file to delete
         server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
         endpoint: API endpoint path (default: "/api/files/{filename}")
+        session: Optional requests.Session to use (default: the shared session)
     
     Returns:
         dict: Response from server
@@ -278,11 +606,17 @@ def delete_file(filename, server_url=None, endpoint=None):
         endpoint = f"/api/files/{filename}"
     
     delete_url = f"{server_url.rstrip('/')}{endpoint}"
-    
+    sess = session if session is not None else get_session()
+    return _delete_file(sess, delete_url, filename)
+
+
+def _delete_file(sess, delete_url, filename, verbose=True):
+    """Delete a file through an already-built URL."""
     try:
-        print(f"Deleting file: {filename}")
-        print(f"Server: {delete_url}")
-        response = requests.delete(delete_url, timeout=10)
+        if verbose:
+            print(f"Deleting file: {filename}")
+            print(f"Server: {delete_url}")
+        response = sess.delete(delete_url, timeout=10)
         
         if response.status_code == 200:
             return {
@@ -296,15 +630,102 @@ def delete_file(filename, server_url=None, endpoint=None):
                 "response": response.text
             }
     
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
         return {
             "success": False,
             "error": f"Delete error: {str(e)}"
         }
 
 
-def main():
-    """Main function to handle command-line arguments and execute upload."""
+def delete_many(filenames, server_url=None, session=None, max_workers=DELETE_WORKERS):
+    """
+    Delete several files from the server concurrently.
+    
+    DELETEs are issued from a thread pool over one session, so the requests
+    overlap on keep-alive connections instead of paying a round trip each.
+    
+    Args:
+        filenames: Names of the files to delete
+        server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
+        session: Optional requests.Session to use (default: a new session
+                 pooling max_workers connections)
+        max_workers: Number of concurrent DELETEs (default: DELETE_WORKERS)
+    
+    Returns:
+        dict: {filename: result} with delete_file()'s result format
+    """
+    if server_url is None:
+        server_url = DEFAULT_SERVER_URL
+    
+    prefix = f"{server_url.rstrip('/')}/api/files/"
+    sess = session if session is not None else create_session(pool_maxsize=max_workers)
+    filenames = list(filenames)
+    print(f"Deleting {len(filenames)} file(s) from: {prefix}")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda name: _delete_file(sess, prefix + name, name, verbose=False),
+                filenames)
+            return dict(zip(filenames, results))
+    finally:
+        if session is None:
+            sess.close()  # Our own pool: don't leave its keep-alive sockets open
+
+
+class UploadClient:
+    """
+    Upload API bound to one server.
+    
+    Endpoint URLs are built once in the constructor and every call goes
+    through the same keep-alive session, for callers that upload repeatedly
+    (e.g. button_capture.py).
+    """
+    
+    def __init__(self, server_url=None, timeout=30, max_file_size=None, session=None):
+        """
+        Create a client for one server.
+        
+        Args:
+            server_url: Base URL of the server (default: DEFAULT_SERVER_URL)
+            timeout: Upload timeout in seconds (default: 30)
+            max_file_size: Maximum file size in bytes (default: DEFAULT_MAX_FILE_SIZE)
+            session: Optional requests.Session (default: a new pooled session)
+        """
+        base = (server_url or DEFAULT_SERVER_URL).rstrip('/')
+        self.server_url = base
+        self.timeout = timeout
+        self.max_file_size = max_file_size if max_file_size is not None else DEFAULT_MAX_FILE_SIZE
+        self.session = session if session is not None else create_session()
+        self._upload_url = base + DEFAULT_UPLOAD_ENDPOINT
+        self._files_url = base + "/api/files"
+        self._file_prefix = self._files_url + "/"
+    
+    def upload_file(self, file_path, verbose=True, compress=False):
+        """Upload a file; see upload_file() for the arguments and result format."""
+        return _upload_file(self.session, self._upload_url, file_path,
+                            self.max_file_size, self.timeout, verbose, compress)
+    
+    def upload_bytes(self, data, filename, verbose=True):
+        """Upload in-memory file contents; see upload_bytes()."""
+        return _upload_bytes(self.session, self._upload_url, data, filename, self.timeout, verbose)
+    
+    def list_files(self):
+        """Get the list of uploaded files; see list_files()."""
+        return _list_files(self.session, self._files_url)
+    
+    def delete_file(self, filename):
+        """Delete a file from the server; see delete_file()."""
+        return _delete_file(self.session, self._file_prefix + filename, filename)
+    
+    def delete_many(self, filenames, max_workers=DELETE_WORKERS):
+        """Delete several files concurrently; see delete_many()."""
+        return delete_many(filenames, self.server_url, self.session, max_workers)
+
+
+@functools.cache
+def _build_parser():
+    """Build the command-line parser once, on first use by main()."""
     parser = argparse.ArgumentParser(
         description="Upload files from Raspberry Pi to cloud server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -318,6 +739,10 @@ Examples:
   
   # Delete a file
   python3 cloud_upload_test.py --delete filename.jpg --server http://192.168.1.100:5001
+  
+  # Delete several files, or everything on the server
+  python3 cloud_upload_test.py --delete-many a.jpg,b.jpg --server http://192.168.1.100:5001
+  python3 cloud_upload_test.py --delete-all --server http://192.168.1.100:5001
         """
     )
     
@@ -333,6 +758,18 @@ Examples:
         help=f'Server URL (default: {DEFAULT_SERVER_URL})'
     )
     
+    parser.add_argument(
+        '--raw',
+        action='store_true',
+        help='Send the file as a raw octet-stream PUT (sendfile on http://; servers must accept it)'
+    )
+    
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Gzip the request body for files that are not already compressed (server must support it)'
+    )
+    
     parser.add_argument(
         '--list',
         action='store_true',
@@ -345,6 +782,24 @@ Examples:
         help='Delete a file from the server by filename'
     )
     
+    parser.add_argument(
+        '--delete-many',
+        metavar='FILE1,FILE2',
+        help='Delete a comma-separated list of files concurrently'
+    )
+    
+    parser.add_argument(
+        '--delete-all',
+        action='store_true',
+        help='Delete every file listed on the server'
+    )
+    
+    return parser
+
+
+def main():
+    """Main function to handle command-line arguments and execute upload."""
+    parser = _build_parser()
     args = parser.parse_args()
     
     # Handle list command
@@ -376,13 +831,46 @@ Examples:
             print(f"\n✗ Error: {result.get('error', 'Unknown error')}")
         return
     
+    # Handle bulk delete commands
+    if args.delete_many or args.delete_all:
+        session = create_session(pool_maxsize=DELETE_WORKERS)
+        if args.delete_all:
+            listing = list_files(args.server, session=session)
+            if not listing["success"]:
+                print(f"\n✗ Error: {listing.get('error', 'Unknown error')}")
+                sys.exit(1)
+            files = listing.get("files", [])
+            names = [f['name'] for f in files if isinstance(f, dict) and 'name' in f] if isinstance(files, list) else []
+        else:
+            names = [name for name in args.delete_many.split(',') if name]
+        
+        if not names:
+            print("  No files to delete")
+            return
+        
+        results = delete_many(names, args.server, session=session)
+        failed = 0
+        for name, result in results.items():
+            if result["success"]:
+                print(f"✓ {name}")
+            else:
+                failed += 1
+                print(f"✗ {name}: {result.get('error', 'Unknown error')}")
+        print(f"\nDeleted {len(results) - failed}/{len(results)} file(s)")
+        if failed:
+            sys.exit(1)
+        return
+    
     # Handle upload command
     if not args.file_path:
         parser.print_help()
         print("\nError: Please provide a file path to upload")
         sys.exit(1)
     
-    result = upload_file(args.file_path, args.server)
+    if args.raw:
+        result = upload_file_raw(args.file_path, args.server)
+    else:
+        result = upload_file(args.file_path, args.server, compress=args.gzip)
     
     if result["success"]:
         print(f"\n✓ {result.get('message', 'Upload successful')}")
@@ -6,7 +6,8 @@ Supports Arducam 5MP OV5647 and standard Raspberry Pi cameras.
 import os
 
 # Camera type: 'standard' for Arducam OV5647 or Pi camera, 'arducam_16mp' for IMX519, 'auto' for auto-detect
-CAMERA_TYPE = 'standard'  # Options: 'standard', 'arducam_16mp', 'auto'
+# Override per device with WP_CAMERA_TYPE instead of keeping a forked copy of this file
+CAMERA_TYPE = os.environ.get('WP_CAMERA_TYPE', 'standard')  # Options: 'standard', 'arducam_16mp', 'auto'
 # Note: Arducam 5MP OV5647 works as 'standard' camera type
 
 # Camera settings
@@ -24,6 +25,9 @@ CAMERA_ISO = 0  # Auto ISO
 # Image settings
 IMAGE_FORMAT = 'jpeg'
 IMAGE_QUALITY = 85
+# Encode JPEGs on the VideoCore hardware encoder (V4L2 M2M) instead of the CPU.
+# Frees the Pi Zero 2W's cores; quality is mapped to picamera2's Quality presets.
+HARDWARE_JPEG = False
 # Image directory - change this path to save images to a specific location
 IMAGE_DIR = os.path.expanduser('~/wearable-pin/images')
 # Alternative locations:
@@ -35,9 +39,29 @@ IMAGE_DIR = os.path.expanduser('~/wearable-pin/images')
 CAPTURE_DELAY = 0  # Seconds before capture
 PREVIEW_TIME = 2  # Seconds to show preview
 
-# Ensure image directory exists
-os.makedirs(IMAGE_DIR, exist_ok=True)
-
 # Service settings
 SERVICE_PORT = 8080
 SERVICE_HOST = '0.0.0.0'
+
+# Allowed values for the settings above, checked once at import
+# (the check is compiled out entirely under python -O)
+VALID_VALUES = {
+    'CAMERA_TYPE': frozenset(('standard', 'arducam_16mp', 'auto')),
+    'CAMERA_ROTATION': frozenset((0, 90, 180, 270)),
+    'IMAGE_FORMAT': frozenset(('jpeg', 'png', 'bmp')),
+    'IMAGE_QUALITY': range(1, 101),
+}
+if __debug__:
+    for _name, _allowed in VALID_VALUES.items():
+        if globals()[_name] not in _allowed:
+            print(f"⚠ config.py: unsupported {_name} = {globals()[_name]!r}")
+
+
+def ensure_dirs():
+    """
+    Create IMAGE_DIR if needed.
+    
+    Called by CameraCapture before its first capture into IMAGE_DIR, so
+    importing config (or opening a camera) never touches the filesystem.
+    """
+    os.makedirs(IMAGE_DIR, exist_ok=True)
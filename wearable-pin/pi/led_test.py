@@ -24,6 +24,15 @@ LED_PIN = board.D13   # GPIO13
 NUM_LEDS = 1
 BRIGHTNESS = 0.3      # Brightness level (0.0 to 1.0, keep low for wearable)
 
+# Test colors, packed as 0xRRGGBB once so no tuple is unpacked per update
+COLORS = [
+    (0xFF0000, "Red"),
+    (0x00FF00, "Green"),
+    (0x0000FF, "Blue"),
+    (0xFFFFFF, "White"),
+    (0x000000, "Off")
+]
+
 
 def initialize_led_strip():
     """Initialize the NeoPixel LED strip."""
@@ -49,13 +58,15 @@ def initialize_led_strip():
 
 
 def show(pixels, color):
-    """Set LED to specified color and wait.
+    """Set all LEDs to specified color and wait.
     
     Args:
         pixels: NeoPixel object
-        color: Tuple of (R, G, B) values (0-255)
+        color: Packed 0xRRGGBB color (see COLORS)
     """
-    pixels[0] = color
+    # fill() writes every pixel in the C pixel buffer and pushes them out in a
+    # single show(), instead of one Python-level write (and show) per LED
+    pixels.fill(color)
     time.sleep(1)
 
 
@@ -79,22 +90,13 @@ def main():
     # Initialize LED strip
     pixels = initialize_led_strip()
     
-    # Color definitions (R, G, B)
-    colors = [
-        ((255, 0, 0), "Red"),
-        ((0, 255, 0), "Green"),
-        ((0, 0, 255), "Blue"),
-        ((255, 255, 255), "White"),
-        ((0, 0, 0), "Off")
-    ]
-    
     print("\nStarting color cycle...")
     print("Each color will display for 1 second")
     print("Press Ctrl+C to exit early\n")
     
     try:
         # Cycle through colors
-        for color, color_name in colors:
+        for color, color_name in COLORS:
             print(f"Setting LED to {color_name}...")
             show(pixels, color)
         
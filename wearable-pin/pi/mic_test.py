@@ -2,133 +2,594 @@
 """
 Microphone test script for PH0645 I2S microphone
 Button-triggered audio recording
-Uses arecord with I2S interface
+Captures directly through ALSA with pyalsaaudio (falls back to arecord)
+The capture device stays open between recordings
 """
 
+import ctypes
+import ctypes.util
+import fcntl
+import mmap
 import os
+import queue
+import select
+import shutil
+import signal
 import time
 import subprocess
+import threading
+import wave
 from datetime import datetime
 
+from sysinfo import drop_page_cache, use_lgpio_pin_factory
+
+try:
+    import alsaaudio
+    ALSAAUDIO_AVAILABLE = True
+except ImportError:
+    # Fall back to one long-lived arecord process piping raw PCM
+    ALSAAUDIO_AVAILABLE = False
+
 try:
-    from gpiozero import Button
+    from gpiozero import Button as _GpiozeroButton
     GPIOZERO_AVAILABLE = True
 except ImportError:
     GPIOZERO_AVAILABLE = False
-    print("Error: gpiozero not available. Install with: sudo apt-get install python3-gpiozero")
-    exit(1)
+    try:
+        # Fall back to a small epoll-driven button on libgpiod (see _GpiodButton)
+        import gpiod
+    except ImportError:
+        print("Error: gpiozero not available. Install with: sudo apt-get install python3-gpiozero")
+        exit(1)
+
+# Prefer the lgpio pin factory: edges come from the kernel's GPIO line events
+# rather than a polling thread
+if GPIOZERO_AVAILABLE:
+    use_lgpio_pin_factory()
 
 
 # Configuration
 BUTTON_PIN = 23  # GPIO pin for button
+GPIO_CHIP = "gpiochip0"  # Chip for the libgpiod fallback (Pi Zero 2W / 3 / 4)
 SAVE_DIR = os.path.expanduser("~/recordings")  # Save location
 SAMPLE_RATE = 48000  # Sample rate in Hz (48kHz)
 CHANNELS = 2  # Stereo recording
 AUDIO_FORMAT = "S32_LE"  # 32-bit signed little-endian
 FORMAT = "wav"  # Audio file format
+ALSA_DEVICE = "hw:0,0"  # I2S device (card 0, device 0 for PH0645)
+PERIOD_SIZE = 1024  # Frames per ALSA read
+SAMPLE_WIDTH = 4  # Bytes per sample for S32_LE
+PERIODS_PER_WRITE = 8  # Periods batched per file write (8 x 8 KiB = 64 KiB at S32_LE stereo)
+DROP_CACHE_BYTES = 4 * 1024 * 1024  # Audio written between page-cache drops (see _Recording)
+RING_PERIODS = 64  # Periods buffered between capture and disk writer (power of two, ~1.4 s)
+PIPE_SIZE = 1024 * 1024  # arecord pipe capacity, absorbs writer stalls without overruns
+BOUNCE_TIME = 0.05  # Edge debounce handled by gpiozero (no sleep in the main loop)
+
+
+# mmap flags the mmap module does not export (Linux values)
+_PROT_NONE = 0
+_MAP_FIXED = 0x10
+_MAP_FAILED = ctypes.c_void_p(-1).value
+
+class _GpiodButton:
+    """
+    Minimal stand-in for gpiozero.Button on the libgpiod (v1) bindings.
+    
+    A daemon thread sleeps in epoll on the line's edge-event fd, so the button
+    costs no CPU until it changes. Supports the subset mic_test uses:
+    is_pressed, when_pressed and when_released.
+    """
+    
+    def __init__(self, pin, pull_up=True, bounce_time=None):
+        chip = gpiod.Chip(GPIO_CHIP)
+        self._line = chip.get_line(pin)
+        self._line.request(
+            consumer="mic_test",
+            type=gpiod.LINE_REQ_EV_BOTH_EDGES,
+            flags=gpiod.LINE_REQ_FLAG_BIAS_PULL_UP if pull_up else 0
+        )
+        self._active = 0 if pull_up else 1
+        self._bounce = bounce_time or 0
+        self._pressed = self._line.get_value() == self._active
+        self.when_pressed = None
+        self.when_released = None
+        self._epoll = select.epoll()
+        self._epoll.register(self._line.event_get_fd(), select.EPOLLIN)
+        threading.Thread(target=self._watch, daemon=True).start()
+    
+    @property
+    def is_pressed(self):
+        return self._pressed
+    
+    def _watch(self):
+        """Wait for edges and fire callbacks on debounced state changes."""
+        last_change = 0.0
+        timeout = None
+        while True:
+            if self._epoll.poll(timeout):
+                self._line.event_read()
+            timeout = None
+            pressed = self._line.get_value() == self._active
+            if pressed == self._pressed:
+                continue
+            now = time.monotonic()
+            if now - last_change < self._bounce:
+                # Still bouncing: sample the line again once the window closes
+                timeout = self._bounce - (now - last_change)
+                continue
+            last_change = now
+            self._pressed = pressed
+            callback = self.when_pressed if pressed else self.when_released
+            if callback:
+                callback()
+
+
+# The one binding of Button: gpiozero's when available, else the libgpiod fallback
+Button = _GpiozeroButton if GPIOZERO_AVAILABLE else _GpiodButton
+
+
+# Resolved once at import: PATH lookup in-process, no `which` subprocess
+ARECORD_PATH = shutil.which("arecord")
+
+# Output of `arecord -l`, captured on first use and shared by the checks below
+_device_list = None
 
 
 def check_arecord():
     """Check if arecord is available."""
-    try:
+    return ARECORD_PATH is not None
+
+
+def get_audio_devices():
+    """
+    Return the `arecord -l` device listing, running it only once per process.
+    
+    Returns:
+        str: Listing text
+    
+    Raises:
+        OSError, subprocess.SubprocessError: If arecord could not be run
+    """
+    global _device_list
+    if _device_list is None:
         result = subprocess.run(
-            ["which", "arecord"],
+            [ARECORD_PATH or "arecord", "-l"],
             capture_output=True,
-            text=True
+            text=True,
+            timeout=5
         )
-        return result.returncode == 0
-    except:
-        return False
+        _device_list = result.stdout
+    return _device_list
 
 
 def check_i2s_mic():
     """Check if I2S microphone is detected."""
     try:
         # Check if I2S device exists
-        result = subprocess.run(
-            ["arecord", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if "card" in result.stdout.lower():
-            return True
-        return False
-    except:
+        return "card" in get_audio_devices().lower()
+    except (OSError, subprocess.SubprocessError):
         return False
 
 
 def list_audio_devices():
     """List available audio devices."""
     try:
-        result = subprocess.run(
-            ["arecord", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        devices = get_audio_devices()
         print("Available audio devices:")
-        print(result.stdout)
-        return result.stdout
-    except Exception as e:
+        print(devices)
+        return devices
+    except (OSError, subprocess.SubprocessError) as e:
         print(f"Error listing devices: {e}")
         return None
 
 
-def record_audio_while_pressed(filepath, button, sample_rate=SAMPLE_RATE):
-    """Record audio while button is pressed using arecord."""
+def open_pcm(sample_rate=SAMPLE_RATE):
+    """Open the I2S microphone as an ALSA capture PCM (no subprocess)."""
+    return alsaaudio.PCM(
+        alsaaudio.PCM_CAPTURE,
+        alsaaudio.PCM_NORMAL,
+        device=ALSA_DEVICE,
+        channels=CHANNELS,
+        rate=sample_rate,
+        format=alsaaudio.PCM_FORMAT_S32_LE,
+        periodsize=PERIOD_SIZE
+    )
+
+
+def _libc():
+    """Load libc with mmap/munmap prototypes for _double_mapped()."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int,
+                          ctypes.c_int, ctypes.c_int, ctypes.c_long]
+    libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    return libc
+
+
+def _double_mapped(size):
+    """
+    Map size bytes of memory twice, back to back, so a view that runs off the
+    end continues at the start (memfd + MAP_FIXED, Linux only).
+    
+    Args:
+        size: Buffer size in bytes (a multiple of the page size)
+    
+    Returns:
+        tuple: (memoryview of 2 * size bytes whose halves alias each other,
+            base address for _unmap()), or None
+    """
     try:
-        # Build arecord command for I2S microphone
-        # For PH0645 with googlevoicehat-soundcard: hw:0,0
-        # Format: arecord -D hw:0,0 -f S32_LE -r 48000 -c 2 test.wav
-        cmd = [
-            "arecord",
-            "-D", "hw:0,0",  # I2S device (card 0, device 0 for PH0645)
-            "-f", AUDIO_FORMAT,  # 32-bit signed little-endian
-            "-r", str(sample_rate),  # Sample rate (48kHz)
-            "-c", str(CHANNELS),  # Channels (stereo)
-            filepath
-        ]
-        
-        print("Recording... (release button to stop)")
+        libc = _libc()
+        fd = os.memfd_create("mic-ring")
+    except (OSError, AttributeError):
+        return None
+    try:
+        os.ftruncate(fd, size)
+        # Reserve 2 * size of address space, then map the memfd over each half
+        base = libc.mmap(None, 2 * size, _PROT_NONE,
+                         mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS, -1, 0)
+        if base in (None, _MAP_FAILED):
+            return None
+        for offset in (0, size):
+            addr = libc.mmap(base + offset, size, mmap.PROT_READ | mmap.PROT_WRITE,
+                             mmap.MAP_SHARED | _MAP_FIXED, fd, 0)
+            if addr != base + offset:
+                libc.munmap(base, 2 * size)
+                return None
+    finally:
+        os.close(fd)
+    # Unmapped by _PeriodRing.close(); the memfd pages go with the last mapping
+    return memoryview((ctypes.c_char * (2 * size)).from_address(base)).cast('B'), base
+
+
+def _unmap(base, size):
+    """Release a _double_mapped() buffer of size bytes (both halves)."""
+    _libc().munmap(base, 2 * size)
+
+
+class _PeriodRing:
+    """
+    Single-producer/single-consumer ring of fixed-size period slots.
+    
+    Only the reader thread advances head and only the writer thread advances
+    tail, so the data path needs no lock: each index has one owner and int
+    assignment is atomic under the GIL. The Event only wakes an idle writer.
+    
+    The buffer is double-mapped where possible, so the writer can take every
+    queued slot as one contiguous view even when the run wraps.
+    """
+    
+    def __init__(self, slots, slot_bytes):
+        if slots & (slots - 1):
+            raise ValueError("ring size must be a power of two")
+        self.mask = slots - 1
+        self.slot_bytes = slot_bytes
+        self.size = slots * slot_bytes
+        mapped = _double_mapped(self.size)
+        self.wraps = mapped is not None
+        if self.wraps:
+            self.buf, self._base = mapped
+        else:
+            self.buf, self._base = memoryview(bytearray(self.size)), None
+        self.lengths = [0] * slots
+        self.tags = [None] * slots
+        self.head = 0
+        self.tail = 0
+        self.ready = threading.Event()
+    
+    def slot(self, index):
+        """Return the writable view for ring position index."""
+        start = (index & self.mask) * self.slot_bytes
+        return self.buf[start:start + self.slot_bytes]
+    
+    def run(self, index, tag):
+        """
+        Return (view, count) covering the queued slots from index owned by tag.
         
-        # Start recording process
-        recording_process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        A short (final) period ends the run, as does the end of the buffer
+        when it is not double-mapped.
+        """
+        head = self.head
+        mask = self.mask
+        count = 0
+        length = 0
+        while index + count < head and self.tags[(index + count) & mask] is tag:
+            n = self.lengths[(index + count) & mask]
+            count += 1
+            length += n
+            if n != self.slot_bytes or (not self.wraps and (index + count) & mask == 0):
+                break
+        start = (index & mask) * self.slot_bytes
+        return self.buf[start:start + length], count
+    
+    def full(self):
+        return self.head - self.tail > self.mask
+    
+    def close(self):
+        """
+        Unmap the buffer. Only call once nothing can touch it again (reader
+        and writer threads joined); any view of it is invalid afterwards.
+        """
+        if self._base is not None:
+            try:
+                self.buf.release()
+            except BufferError:
+                return  # A view is still exported; leave the mapping in place
+            _unmap(self._base, self.size)
+            self._base = None
+    
+    def publish(self, length, tag):
+        """Hand the slot at head (length bytes, owned by tag) to the writer."""
+        i = self.head & self.mask
+        self.lengths[i] = length
+        self.tags[i] = tag
+        self.head += 1
+        self.ready.set()
+
+
+class _Recording:
+    """
+    One WAV file being written by the capture stream's writer thread.
+    
+    Audio is never read back, so every DROP_CACHE_BYTES the file's pages are
+    handed back to the kernel (camera and Python pages stay cached instead).
+    DONTNEED starts writeback of the newest pages and evicts the older ones
+    that are already clean, without the alignment rules of O_DIRECT.
+    """
+    
+    def __init__(self, filepath, sample_rate, buffer_size):
+        # Buffered so periods reach the SD card in PERIODS_PER_WRITE batches
+        self.file = open(filepath, 'wb', buffering=buffer_size)
+        self.wav = wave.open(self.file, 'wb')
+        self.wav.setnchannels(CHANNELS)
+        self.wav.setsampwidth(SAMPLE_WIDTH)
+        self.wav.setframerate(sample_rate)
+        self.written = 0
+        self.dropped = 0
+        self._next_drop = DROP_CACHE_BYTES
+        self.finished = False
+        self.done = threading.Event()
+    
+    def write(self, view):
+        """Append PCM frames, dropping written pages from the cache as it grows."""
+        self.wav.writeframesraw(view)
+        self.written += len(view)
+        if self.written >= self._next_drop:
+            self._next_drop = self.written + DROP_CACHE_BYTES
+            self.file.flush()
+            drop_page_cache(self.file)
+    
+    def finish(self):
+        """Close the file; wave patches the RIFF and data sizes here."""
+        try:
+            self.wav.close()
+            self.file.flush()
+            drop_page_cache(self.file)
+            self.file.close()
+        finally:
+            self.finished = True
+            self.done.set()
+
+
+class CaptureStream:
+    """
+    Long-lived microphone capture shared by every recording.
+    
+    The ALSA PCM (or a single arecord process writing raw PCM to a pipe) is
+    opened once and drained continuously by a reader thread. Periods are
+    discarded unless a recording is active, so a press starts writing within
+    one period instead of waiting for a process spawn and device open.
+    
+    Recorded periods go through a _PeriodRing to a separate writer thread, so
+    SD card stalls never hold up the reader and cause ALSA overruns.
+    """
+    
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.period_bytes = PERIOD_SIZE * CHANNELS * SAMPLE_WIDTH
+        self.error = None
+        self.bytes_read = 0  # Everything captured, recorded or not
+        self._pcm = None
+        self._proc = None
+        self._reader_thread = None
+        self._writer_thread = None
+        self._running = False
+        self._ring = _PeriodRing(RING_PERIODS, self.period_bytes)
+        # Periods read while idle (or while the ring is full) land here
+        self._scratch = memoryview(bytearray(self.period_bytes))
+        self._target = None  # _Recording the reader should capture into
+    
+    def start(self):
+        """Open the capture device and start the reader and writer threads."""
+        if ALSAAUDIO_AVAILABLE:
+            self._pcm = open_pcm(self.sample_rate)
+        else:
+            cmd = [
+                ARECORD_PATH or "arecord",
+                "-D", ALSA_DEVICE,
+                "-f", AUDIO_FORMAT,
+                "-r", str(self.sample_rate),
+                "-c", str(CHANNELS),
+                "-t", "raw",  # Headerless PCM on stdout; Python writes the WAV
+                "-q"
+            ]
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=self.period_bytes,  # One read() per period
+                start_new_session=True  # Ctrl+C is handled here, not sent to arecord
+            )
+            try:
+                fcntl.fcntl(self._proc.stdout.fileno(),
+                            getattr(fcntl, 'F_SETPIPE_SZ', 1031), PIPE_SIZE)
+            except OSError:
+                pass  # Above /proc/sys/fs/pipe-max-size; keep the 64 KiB default
+        self._running = True
+        self._writer_thread = threading.Thread(target=self._writer, daemon=True)
+        self._writer_thread.start()
+        self._reader_thread = threading.Thread(target=self._reader, daemon=True)
+        self._reader_thread.start()
+    
+    def _read_into(self, view):
+        """Read one period into view; 0 on an ALSA overrun, None once arecord exits."""
+        if self._pcm is not None:
+            length, data = self._pcm.read()
+            if length <= 0:
+                return 0
+            view[:len(data)] = data
+            return len(data)
+        return self._proc.stdout.readinto(view) or None
+    
+    def _reader(self):
+        """Drain the device, queueing periods for the current recording."""
+        ring = self._ring
+        try:
+            while self._running:
+                target = self._target
+                if target is None or ring.full():
+                    if target is not None:
+                        target.dropped += 1  # Writer is behind; never block capture
+                    n = self._read_into(self._scratch)
+                else:
+                    n = self._read_into(ring.slot(ring.head))
+                    if n:
+                        ring.publish(n, target)
+                if n is None:
+                    self.error = RuntimeError("arecord exited")
+                    break
+                self.bytes_read += n
+        except Exception as e:
+            self.error = e
+        finally:
+            self._running = False
+            ring.ready.set()
+    
+    def _writer(self):
+        """Write queued periods to their recordings; finish ones that were stopped."""
+        ring = self._ring
+        current = None
+        while True:
+            if ring.tail == ring.head:
+                if current is not None and current is not self._target:
+                    current.finish()
+                    current = None
+                if not self._running and current is None:
+                    break
+                ring.ready.wait(0.1)
+                ring.ready.clear()
+                continue
+            rec = ring.tags[ring.tail & ring.mask]
+            if rec is not current:
+                if current is not None:
+                    current.finish()
+                # A period read just as its recording stopped is dropped
+                current = None if rec.finished else rec
+            # Everything queued for this recording goes out in one write
+            view, count = ring.run(ring.tail, rec)
+            if current is not None:
+                try:
+                    current.write(view)
+                except OSError as e:
+                    self.error = e
+                    self._target = None
+                    current.finish()
+                    current = None
+            for index in range(ring.tail, ring.tail + count):
+                ring.tags[index & ring.mask] = None
+            ring.tail += count
+    
+    def start_recording(self, filepath):
+        """
+        Start appending captured audio to a new WAV file.
         
-        # Wait for button release
-        button.wait_for_release()
+        Args:
+            filepath: Output WAV path
+        """
+        if not self._running:
+            raise RuntimeError(f"Capture stream stopped: {self.error}")
+        self._target = _Recording(filepath, self.sample_rate,
+                                  self.period_bytes * PERIODS_PER_WRITE)
+    
+    def stop_recording(self):
+        """
+        Finish the current recording once the writer has drained it.
         
-        # Stop recording
-        recording_process.terminate()
+        Returns:
+            tuple: (audio bytes written, periods dropped)
+        """
+        rec, self._target = self._target, None
+        if rec is None:
+            return 0, 0
+        self._ring.ready.set()
+        if not rec.done.wait(timeout=5):
+            rec.finish()  # Writer thread is gone; close the file ourselves
+        return rec.written, rec.dropped
+    
+    def close(self):
+        """Stop both threads and release the device."""
+        self.stop_recording()
+        self._running = False
+        if self._proc is not None:
+            # arecord exits promptly on SIGINT; escalate only if it does not
+            for sig, grace in ((signal.SIGINT, 0.2), (signal.SIGTERM, 0.5), (signal.SIGKILL, None)):
+                self._proc.send_signal(sig)
+                try:
+                    self._proc.wait(timeout=grace)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+        for thread in (self._reader_thread, self._writer_thread):
+            if thread is not None:
+                self._ring.ready.set()
+                thread.join(timeout=2)
+        if self._pcm is not None:
+            self._pcm.close()
+        # A thread that didn't stop could still write into the ring; keep it mapped then
+        if not any(t is not None and t.is_alive() for t in (self._reader_thread, self._writer_thread)):
+            self._ring.close()
+
+
+def record_audio_while_pressed(filepath, button, stream):
+    """Record audio from the running capture stream while button is pressed."""
+    try:
+        stream.start_recording(filepath)
+        print("Recording... (release button to stop)")
         
-        # Wait a moment for process to finish
-        try:
-            recording_process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            recording_process.kill()
-            recording_process.wait()
+        # Wait for button release (set from gpiozero's edge callback)
+        released = threading.Event()
+        button.when_released = released.set
+        if button.is_pressed:
+            released.wait()
+        button.when_released = None
         
-        # Check if file was created
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-            file_size = os.path.getsize(filepath)
-            file_size_kb = file_size / 1024
-            file_size_mb = file_size / (1024 * 1024)
-            print(f"✓ Audio recorded: {filepath}")
-            print(f"  Size: {file_size:,} bytes ({file_size_kb:.2f} KB / {file_size_mb:.2f} MB)")
-            return True
-        else:
-            print(f"✗ Recording failed - file not created or empty")
-            return False
+        written, dropped = stream.stop_recording()
+        if dropped:
+            print(f"⚠ {dropped} period(s) dropped - storage could not keep up")
+        return _report_recording(filepath)
             
     except Exception as e:
+        stream.stop_recording()
         print(f"✗ Recording failed: {e}")
         return False
 
 
+def _report_recording(filepath):
+    """Print the size of a finished recording; False if it is missing or empty."""
+    # Check if file was created
+    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+        file_size = os.path.getsize(filepath)
+        file_size_kb = file_size / 1024
+        file_size_mb = file_size / (1024 * 1024)
+        print(f"✓ Audio recorded: {filepath}")
+        print(f"  Size: {file_size:,} bytes ({file_size_kb:.2f} KB / {file_size_mb:.2f} MB)")
+        return True
+    else:
+        print(f"✗ Recording failed - file not created or empty")
+        return False
+
+
 def test_button():
     """Test button functionality - shows presses in command line."""
     print("=" * 50)
@@ -139,18 +600,20 @@ def test_button():
     print("Press Ctrl+C to exit")
     print("=" * 50)
     
-    button = Button(BUTTON_PIN, pull_up=True)
+    button = Button(BUTTON_PIN, pull_up=True, bounce_time=BOUNCE_TIME)
+    pressed = threading.Event()
+    button.when_pressed = pressed.set
     press_count = 0
     
     print("\nWaiting for button press...")
     
     try:
         while True:
-            button.wait_for_press()
+            pressed.wait()
+            pressed.clear()
             press_count += 1
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             print(f"[{timestamp}] Button pressed! (Count: {press_count})")
-            time.sleep(0.3)
             
     except KeyboardInterrupt:
         print(f"\n\nTest complete. Total presses detected: {press_count}")
@@ -191,14 +654,16 @@ def main():
     print(f"Save location: {SAVE_DIR}")
     print("=" * 50)
     
-    # Check if arecord is available
-    if not check_arecord():
-        print("✗ Error: arecord not found")
+    # Capture backend: pyalsaaudio, or arecord as a fallback
+    if ALSAAUDIO_AVAILABLE:
+        print("✓ pyalsaaudio found (direct ALSA capture)")
+    elif not check_arecord():
+        print("✗ Error: neither pyalsaaudio nor arecord found")
         print("\nInstall with:")
-        print("  sudo apt-get install -y alsa-utils")
+        print("  sudo apt-get install -y python3-alsaaudio alsa-utils")
         exit(1)
-    
-    print("✓ arecord found")
+    else:
+        print("✓ arecord found (pyalsaaudio not available)")
     
     # List audio devices
     print("\nChecking audio devices...")
@@ -225,31 +690,35 @@ def main():
     
     # Setup button
     print(f"\nSetting up button on GPIO {BUTTON_PIN}...")
-    button = Button(BUTTON_PIN, pull_up=True)
+    button = Button(BUTTON_PIN, pull_up=True, bounce_time=BOUNCE_TIME)
+    # Presses arrive from gpiozero's edge callback; the main thread records
+    press_queue = queue.Queue(maxsize=2)
+    
+    def on_press():
+        try:
+            press_queue.put_nowait(time.monotonic())
+        except queue.Full:
+            pass  # A recording is already pending
+    
+    button.when_pressed = on_press
     print("Button ready!")
     
-    # Test recording (quick 1 second test)
+    # Open the capture device once; every recording reuses it
+    stream = CaptureStream()
+    try:
+        stream.start()
+    except Exception as e:
+        print(f"✗ Could not open microphone: {e}")
+        exit(1)
+    
+    # Test capture (quick 1 second test, counted in memory - nothing written to disk)
     print("\nTesting microphone...")
-    test_file = os.path.join(SAVE_DIR, "test_mic.wav")
-    test_cmd = [
-        "arecord",
-        "-D", "hw:0,0",
-        "-f", AUDIO_FORMAT,
-        "-r", str(SAMPLE_RATE),
-        "-c", str(CHANNELS),
-        "-d", "1",  # 1 second test
-        test_file
-    ]
     try:
-        result = subprocess.run(test_cmd, capture_output=True, text=True, timeout=5)
-        if result.returncode == 0 and os.path.exists(test_file):
-            file_size = os.path.getsize(test_file)
-            print(f"✓ Microphone test successful ({file_size} bytes)")
-            # Remove test file
-            try:
-                os.remove(test_file)
-            except:
-                pass
+        before = stream.bytes_read
+        time.sleep(1)
+        captured = stream.bytes_read - before
+        if captured > 0 and stream.error is None:
+            print(f"✓ Microphone test successful ({captured} bytes)")
         else:
             print("✗ Microphone test failed")
             print("\nTroubleshooting:")
@@ -258,9 +727,11 @@ def main():
             print("3. Check wiring: SCK->GPIO18, WS->GPIO19, SD->GPIO20")
             print("4. Check device: arecord -l")
             print(f"5. Try: arecord -D hw:0,0 -f {AUDIO_FORMAT} -r {SAMPLE_RATE} -c {CHANNELS} -d 1 test.wav")
+            stream.close()
             exit(1)
     except Exception as e:
         print(f"✗ Microphone test failed: {e}")
+        stream.close()
         exit(1)
     
     # Main loop
@@ -273,7 +744,9 @@ def main():
         while True:
             # Wait for button press
             print("\nPress and HOLD button to start recording...")
-            button.wait_for_press()
+            press_queue.get()
+            if not button.is_pressed:
+                continue  # Released before we got to it (e.g. a bounce)
             print("Button pressed! Recording started...")
             
             # Generate filename with timestamp
@@ -282,17 +755,15 @@ def main():
             filepath = os.path.join(SAVE_DIR, filename)
             
             # Record audio while button is pressed
-            if record_audio_while_pressed(filepath, button):
+            if record_audio_while_pressed(filepath, button, stream):
                 print("Ready for next recording...")
             else:
                 print("Recording failed. Ready to try again...")
             
-            # Small delay to prevent multiple recordings from button bounce
-            time.sleep(0.3)
-            
     except KeyboardInterrupt:
         print("\n\nShutting down...")
     finally:
+        stream.close()
         print("Done!")
 
 
@@ -63,6 +63,10 @@ echo "Setting up systemd services..."
 sudo cp services/camera.service /etc/systemd/system/
 sudo sed -i "s|/home/pi/wearable-pin|$INSTALL_DIR/wearable-pin|g" /etc/systemd/system/camera.service
 
+# Copy and configure throttle status poller
+sudo cp services/throttle-poller.service /etc/systemd/system/
+sudo sed -i "s|/home/pi/wearable-pin|$INSTALL_DIR/wearable-pin|g" /etc/systemd/system/throttle-poller.service
+
 # Copy and configure update service
 sudo cp services/update.service /etc/systemd/system/
 sudo sed -i "s|/home/pi/wearable-pin|$INSTALL_DIR/wearable-pin|g" /etc/systemd/system/update.service
@@ -78,12 +82,14 @@ sudo systemctl daemon-reload
 echo ""
 echo "Enabling services..."
 sudo systemctl enable camera.service
+sudo systemctl enable throttle-poller.service
 sudo systemctl enable update.timer
 
 # Start services
 echo ""
 echo "Starting services..."
 sudo systemctl start update.timer
+sudo systemctl start throttle-poller.service
 sudo systemctl start camera.service
 
 # Check status
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Lightweight system probes and helpers shared by the wearable pin scripts.
+Values read from procfs are memoized briefly so back-to-back checks
+don't make the kernel re-render the same pseudo-file.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+
+# Seconds a /proc/meminfo snapshot is reused
+MEMINFO_TTL = 2
+
+# On-disk cache for slow probe commands (libcamera-hello, vcgencmd)
+PROBE_CACHE_FILE = os.path.expanduser('~/.cache/wearable-pin/probes.json')
+
+# Written by throttle_poller.py (vcgencmd get_throttled bitfield, hex)
+THROTTLE_STATE_FILE = '/run/wearable/throttle_state'
+
+_MEMINFO_RE = re.compile(rb'^(MemTotal|MemFree|MemAvailable):\s+(\d+)', re.M)
+_meminfo_cache = (0.0, None)
+
+
+def read_meminfo():
+    """
+    Read the memory totals from /proc/meminfo.
+    
+    Returns:
+        dict: Field name to value in kB, for whichever of MemTotal, MemFree
+        and MemAvailable are present
+    
+    Raises:
+        OSError: If /proc/meminfo cannot be read
+    """
+    global _meminfo_cache
+    now = time.monotonic()
+    ts, data = _meminfo_cache
+    if data is not None and now - ts < MEMINFO_TTL:
+        return data
+    
+    # One read of the whole file (well under 8KB) so the fields are consistent
+    fd = os.open('/proc/meminfo', os.O_RDONLY)
+    try:
+        buf = os.read(fd, 8192)
+    finally:
+        os.close(fd)
+    
+    data = {name.decode(): int(value) for name, value in _MEMINFO_RE.findall(buf)}
+    _meminfo_cache = (now, data)
+    return data
+
+
+def run_cached(argv, ttl, timeout=None):
+    """
+    Run a probe command, reusing its result from a recent run if there is one.
+    
+    Results are kept in PROBE_CACHE_FILE keyed on the argument list, so they
+    survive across invocations of the calling script. Only successful runs
+    (returncode 0) are cached, so a failure such as "no cameras available" is
+    re-checked next time. Commands that time out or are missing raise as
+    subprocess.run() would and are not cached.
+    
+    Args:
+        argv: Command and arguments
+        ttl: Seconds a cached result stays valid (0 always runs the command)
+        timeout: Timeout passed to subprocess.run()
+    
+    Returns:
+        subprocess.CompletedProcess with text stdout/stderr
+    """
+    key = "\0".join(argv)
+    try:
+        with open(PROBE_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    
+    entry = cache.get(key)
+    if ttl > 0 and entry and time.time() - entry['ts'] < ttl:
+        return subprocess.CompletedProcess(argv, entry['returncode'], entry['stdout'], entry['stderr'])
+    
+    result = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        # Failures (camera unplugged, ribbon reseated...) must not stick
+        if cache.pop(key, None) is not None:
+            _write_probe_cache(cache)
+        return result
+    cache[key] = {
+        'ts': time.time(),
+        'returncode': result.returncode,
+        'stdout': result.stdout,
+        'stderr': result.stderr,
+    }
+    _write_probe_cache(cache)
+    return result
+
+
+def _write_probe_cache(cache):
+    """Save the run_cached() results to PROBE_CACHE_FILE."""
+    try:
+        os.makedirs(os.path.dirname(PROBE_CACHE_FILE), exist_ok=True)
+        with open(PROBE_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # Caching is best-effort
+
+
+def disk_free_bytes(path=None):
+    """
+    Free space available to unprivileged users on the filesystem holding path.
+    
+    Args:
+        path: Directory to check (default: $HOME)
+    
+    Returns:
+        int: Free bytes
+    
+    Raises:
+        OSError: If the filesystem cannot be queried
+    """
+    if path is None:
+        path = os.environ.get('HOME') or os.path.expanduser('~')
+    # One statvfs is cheaper than any cache, and free space changes per capture
+    stat = os.statvfs(path)
+    return stat.f_bavail * stat.f_frsize
+
+
+_boot_id = None
+_pin_factory_set = False
+
+
+def boot_id():
+    """
+    Return the kernel's random boot ID (changes on every boot).
+    
+    Returns:
+        str: Boot ID, or None if it cannot be read
+    """
+    global _boot_id
+    if _boot_id is None:
+        try:
+            with open('/proc/sys/kernel/random/boot_id', 'r') as f:
+                _boot_id = f.read().strip()
+        except OSError:
+            return None
+    return _boot_id
+
+
+def drop_page_cache(f):
+    """Ask the kernel to write back and evict a just-written file's pages."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def pin_thread(cpus):
+    """
+    Restrict the calling thread to the given CPU cores.
+    
+    Cores the system doesn't have are ignored; does nothing if none are left
+    or sched_setaffinity is unavailable (non-Linux).
+    
+    Args:
+        cpus: Set of CPU numbers
+    """
+    cpus = {cpu for cpu in cpus if cpu < (os.cpu_count() or 1)}
+    if hasattr(os, 'sched_setaffinity') and cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
+
+
+def use_lgpio_pin_factory():
+    """
+    Make gpiozero use the lgpio pin factory, once per process.
+    
+    Edges then come from the kernel's GPIO line events rather than a polling
+    thread. Scripts that import each other all call this; only the first call
+    opens the gpiochip, so no factory is created and then replaced. Does
+    nothing if GPIOZERO_PIN_FACTORY is set or lgpio is unavailable.
+    """
+    global _pin_factory_set
+    if _pin_factory_set or "GPIOZERO_PIN_FACTORY" in os.environ:
+        return
+    _pin_factory_set = True
+    try:
+        from gpiozero import Device
+        from gpiozero.pins.lgpio import LGPIOFactory
+        Device.pin_factory = LGPIOFactory()
+    except Exception:
+        pass  # Fall back to gpiozero's default pin factory
+
+
+def read_throttle_state():
+    """
+    Read the throttle bits last recorded by throttle_poller.py.
+    
+    Returns:
+        int: vcgencmd get_throttled bitfield, or None if the poller isn't running
+    """
+    try:
+        with open(THROTTLE_STATE_FILE, 'r') as f:
+            return int(f.read().strip(), 16)
+    except (OSError, ValueError):
+        return None
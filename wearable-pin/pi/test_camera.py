@@ -10,61 +10,88 @@ import time
 from pathlib import Path
 
 import config
-from capture_image import CameraCapture
+from capture_image import CameraCapture, get_camera, release_camera
 
 
-def test_camera_initialization():
-    """Test camera initialization."""
+# Settings every script relies on; allowed values come from config.VALID_VALUES
+REQUIRED_ATTRS = (
+    'CAMERA_RESOLUTION',
+    'CAMERA_FRAMERATE',
+    'IMAGE_FORMAT',
+    'IMAGE_DIR',
+)
+
+def test_camera_initialization(shared=False):
+    """
+    Test camera initialization.
+    
+    Args:
+        shared: Initialize the pooled get_camera() instance and leave it
+            running for the following tests, instead of a temporary camera
+    """
     print("\n[TEST] Camera Initialization")
     print("-" * 40)
     
-    camera = CameraCapture()
-    result = camera.initialize()
+    if shared:
+        result = get_camera() is not None
+    else:
+        camera = CameraCapture()
+        result = camera.initialize()
+        if result:
+            camera.cleanup()
     
     if result:
         print("✓ Camera initialized successfully")
-        camera.cleanup()
         return True
     else:
         print("✗ Camera initialization failed")
         return False
 
 
-def test_image_capture():
-    """Test image capture functionality."""
+def test_image_capture(camera=None):
+    """
+    Test image capture functionality.
+    
+    Args:
+        camera: Optional initialized CameraCapture (left running);
+            if None, a temporary one is initialized and cleaned up
+    """
     print("\n[TEST] Image Capture")
     print("-" * 40)
     
-    camera = CameraCapture()
-    
-    if not camera.initialize():
-        print("✗ Cannot test capture - initialization failed")
-        return False
+    shared = camera is not None
+    if not shared:
+        camera = CameraCapture()
+        if not camera.initialize():
+            print("✗ Cannot test capture - initialization failed")
+            return False
     
     try:
-        # Test capture with default filename
-        image_path = camera.capture_image()
-        
-        if image_path and os.path.exists(image_path):
-            print(f"✓ Image captured successfully: {image_path}")
-            file_size = os.path.getsize(image_path)
-            print(f"  File size: {file_size} bytes")
-            
-            # Test custom filename
-            custom_path = camera.capture_image("test_custom.jpg")
-            if custom_path and os.path.exists(custom_path):
-                print(f"✓ Custom filename capture successful: {custom_path}")
+        # Test the capture pipeline in memory (no JPEG encode, nothing on disk)
+        if camera.camera is not None:
+            frame = camera.camera.capture_array("main")
+            if frame.size > 0:
+                print(f"✓ Frame captured in memory: {frame.shape}")
             else:
-                print("✗ Custom filename capture failed")
+                print("✗ Image capture failed")
                 return False
-            
-            return True
+        
+        # Test the file path once, with a custom filename
+        custom_path = camera.capture_image("test_custom.jpg")
+        if custom_path and os.path.exists(custom_path):
+            print(f"✓ Custom filename capture successful: {custom_path}")
+            file_size = os.path.getsize(custom_path)
+            print(f"  File size: {file_size} bytes")
+            os.remove(custom_path)
         else:
-            print("✗ Image capture failed")
+            print("✗ Custom filename capture failed")
             return False
+        
+        return True
             
     finally:
-        camera.cleanup()
+        if not shared:
+            camera.cleanup()
 
 
 def test_config_settings():
@@ -75,14 +102,7 @@ def test_config_settings():
     tests_passed = True
     
     # Check required config attributes
-    required_attrs = [
-        'CAMERA_RESOLUTION',
-        'CAMERA_FRAMERATE',
-        'IMAGE_FORMAT',
-        'IMAGE_DIR'
-    ]
-    
-    for attr in required_attrs:
+    for attr in REQUIRED_ATTRS:
         if hasattr(config, attr):
             value = getattr(config, attr)
             print(f"✓ {attr}: {value}")
@@ -90,26 +110,44 @@ def test_config_settings():
             print(f"✗ Missing configuration: {attr}")
             tests_passed = False
     
-    # Check if image directory exists
-    if os.path.exists(config.IMAGE_DIR):
+    # Check values against the allowed sets built once in config.py
+    for attr, allowed in config.VALID_VALUES.items():
+        if getattr(config, attr) not in allowed:
+            print(f"✗ Unsupported {attr}: {getattr(config, attr)!r}")
+            tests_passed = False
+    
+    # Check if image directory exists (created on demand by the first capture into it)
+    if os.path.isdir(config.IMAGE_DIR):
         print(f"✓ Image directory exists: {config.IMAGE_DIR}")
-    else:
-        print(f"✗ Image directory not found: {config.IMAGE_DIR}")
+    elif os.path.exists(config.IMAGE_DIR):
+        print(f"✗ Image directory path is not a directory: {config.IMAGE_DIR}")
         tests_passed = False
+    else:
+        print(f"⚠ Image directory not found (created on first capture): {config.IMAGE_DIR}")
     
     return tests_passed
 
 
-def test_cleanup():
-    """Test cleanup functionality."""
+def test_cleanup(shared=False):
+    """
+    Test cleanup functionality.
+    
+    Args:
+        shared: Release the pooled get_camera() instance instead of
+            initializing and cleaning up a temporary camera
+    """
     print("\n[TEST] Camera Cleanup")
     print("-" * 40)
     
-    camera = CameraCapture()
-    camera.initialize()
+    if not shared:
+        camera = CameraCapture()
+        camera.initialize()
     
     try:
-        camera.cleanup()
+        if shared:
+            release_camera()
+        else:
+            camera.cleanup()
         print("✓ Camera cleanup completed")
         return True
     except Exception as e:
@@ -123,12 +161,21 @@ def run_all_tests():
     print("Raspberry Pi Camera Test Suite")
     print("=" * 40)
     
-    results = {
-        "Configuration": test_config_settings(),
-        "Initialization": test_camera_initialization(),
-        "Image Capture": test_image_capture(),
-        "Cleanup": test_cleanup()
-    }
+    # The hardware tests share the pooled get_camera() instance, so the
+    # warm-up is paid once; release_camera() also runs at exit if a test fails
+    # Output is block-buffered (see __main__); flush once per test so progress
+    # still shows before each slow step
+    results = {"Configuration": test_config_settings()}
+    sys.stdout.flush()
+    results["Initialization"] = test_camera_initialization(shared=True)
+    sys.stdout.flush()
+    if results["Initialization"]:
+        results["Image Capture"] = test_image_capture(get_camera())
+    else:
+        print("\n✗ Cannot test capture - initialization failed")
+        results["Image Capture"] = False
+    sys.stdout.flush()
+    results["Cleanup"] = test_cleanup(shared=True)
     
     print("\n" + "=" * 40)
     print("Test Results Summary")
@@ -148,5 +195,8 @@ def run_all_tests():
 
 
 if __name__ == "__main__":
+    # One write per test rather than per line (matters over SSH / serial consoles)
+    sys.stdout.reconfigure(line_buffering=False)
     success = run_all_tests()
+    sys.stdout.flush()
     sys.exit(0 if success else 1)
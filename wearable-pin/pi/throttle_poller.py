@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Throttle status poller for Raspberry Pi wearable pin.
+
+Runs `vcgencmd get_throttled` periodically in its own low-priority process
+and writes the result to THROTTLE_STATE_FILE, so other scripts can read the
+throttle bits with a single file read instead of forking vcgencmd themselves.
+
+Usage:
+    python3 throttle_poller.py              # Poll every 10 seconds
+    python3 throttle_poller.py --once       # Write the current state and exit
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from sysinfo import THROTTLE_STATE_FILE
+
+# Seconds between vcgencmd calls
+POLL_INTERVAL = 10
+
+
+def read_throttled():
+    """
+    Ask the firmware for the current throttle bits.
+    
+    Returns:
+        int: get_throttled bitfield, or None if vcgencmd failed
+    """
+    try:
+        result = subprocess.run(['vcgencmd', 'get_throttled'],
+                                capture_output=True, text=True, timeout=5)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    if result.returncode != 0:
+        return None
+    # Output format: "throttled=0x50000"
+    try:
+        return int(result.stdout.strip().split('=', 1)[1], 16)
+    except (IndexError, ValueError):
+        return None
+
+
+def write_state(value):
+    """Atomically replace THROTTLE_STATE_FILE with a hex bitfield."""
+    tmp_path = THROTTLE_STATE_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(f"0x{value:x}\n")
+    os.replace(tmp_path, THROTTLE_STATE_FILE)
+
+
+def main():
+    """Poll the throttle state until interrupted."""
+    once = '--once' in sys.argv
+    os.makedirs(os.path.dirname(THROTTLE_STATE_FILE), exist_ok=True)
+    
+    try:
+        while True:
+            value = read_throttled()
+            if value is not None:
+                write_state(value)
+            elif once:
+                print("✗ vcgencmd get_throttled failed")
+                return 1
+            if once:
+                return 0
+            time.sleep(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,11 +10,18 @@ Hardware:
 - Second button: GPIO 23 (or configure SECOND_BUTTON_PIN) - reserved for future use
 """
 
+import importlib.util
+import logging
+import logging.handlers
 import os
+import queue
+import shutil
 import time
 import subprocess
+from array import array
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -26,6 +33,22 @@ except ImportError:
     print("Error: gpiozero not available. Install with: sudo apt-get install python3-gpiozero")
     sys.exit(1)
 
+# Edge interrupts from the kernel (lgpio alerts) instead of a polling pin backend
+from sysinfo import pin_thread, use_lgpio_pin_factory
+use_lgpio_pin_factory()
+
+# Photos come from a Picamera2 opened once per session (via capture_image);
+# rpicam-still per photo is the fallback
+PICAMERA_AVAILABLE = importlib.util.find_spec("picamera2") is not None
+
+# JPEG encoding of session photos: libjpeg-turbo (NEON) straight from the
+# YUV420 frame, with picamera2's own encoder as the fallback
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _tj = TurboJPEG()
+except (ImportError, OSError):
+    _tj = None
+
 # Import configuration
 try:
     import button_config as config
@@ -56,9 +79,15 @@ except ImportError:
     UPLOAD_MAX_SIZE_MB = 20
     UPLOAD_TIMEOUT = 30
 
+# Frame size, parsed once rather than on every capture
+WIDTH, HEIGHT = (int(v) for v in RESOLUTION.split("x"))
+
+# Session audio: pyalsaaudio or a raw-PCM arecord pipe, written by Python
+from mic_test import ALSAAUDIO_AVAILABLE, CaptureStream
+
 # Import cloud upload function
 try:
-    from cloud_upload_test import upload_file
+    from cloud_upload_test import UploadClient, create_session
     UPLOAD_AVAILABLE = True
 except ImportError:
     UPLOAD_AVAILABLE = False
@@ -68,8 +97,55 @@ except ImportError:
 PHOTO_INTERVAL = 1.0  # Take photo every 1 second
 AUDIO_SAMPLE_RATE = 48000  # 48kHz
 AUDIO_CHANNELS = 2  # Stereo
-AUDIO_FORMAT = "S32_LE"  # 32-bit signed little-endian
+AUDIO_FORMAT = "S32_LE"  # 32-bit signed little-endian (channels/format as in mic_test)
 SHUTTER_SPEED = 1000  # Shutter speed in microseconds (1000 = 1ms, fast for snappy shots)
+UPLOAD_WORKERS = 4  # Concurrent uploads, each on its own keep-alive connection
+UPLOAD_QUEUE_SIZE = 32  # Photos waiting for the background uploader while recording
+MAIN_CPUS = {0, 1}  # Main thread (buttons, audio and upload threads inherit it)
+PHOTO_CPUS = {2, 3}  # Photo loop: capture + JPEG encode, off the main thread's cores
+LOG_QUEUE_SIZE = 256  # Photo-loop messages waiting for the console (extras are dropped)
+BOUNCE_TIME = 0.05  # Edge debounce handled by gpiozero (no sleep in the main loop)
+BUTTON_DEBOUNCE = 0.2  # Presses this soon after the last accepted one are ignored
+
+# rpicam-still arguments that don't change between captures (fallback path)
+_CMD_PREFIX = [
+    "rpicam-still",
+    "--width", str(WIDTH),
+    "--height", str(HEIGHT),
+    "--quality", str(QUALITY),
+    "--shutter", str(SHUTTER_SPEED),  # Fast shutter speed for snappy shots
+    "--immediate",  # Capture at once: no preview phase (exposure is fixed anyway)
+    "--denoise", "off",  # Skip the full-frame denoise pass
+    "--thumb", "none",  # No EXIF thumbnail to encode
+    "--nopreview"
+]
+
+
+class _DropQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of raising."""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Console is behind; never block the photo loop on it
+
+
+class _LogListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room for its sentinel in the bounded queue."""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# Photo-loop messages go through a bounded queue to a listener thread, so
+# captures never wait on a terminal write (started/stopped by main())
+_log_q = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_log_listener = _LogListener(_log_q, logging.StreamHandler(sys.stdout))
+log = logging.getLogger("two_buttons")
+log.addHandler(_DropQueueHandler(_log_q))
+log.setLevel(logging.INFO)
+log.propagate = False
 
 
 class RecordingSession:
@@ -77,13 +153,22 @@ class RecordingSession:
     
     def __init__(self):
         self.is_recording = False
-        self.audio_process = None
+        self.audio_stream = None  # mic_test.CaptureStream, open only while recording
+        self.camera = None  # Picamera2, open only while recording
+        self.frame_size = None  # (width, height) of the camera's main stream
         self.photo_thread = None
-        self.captured_photos = []
+        self.captured_paths = []
+        self.captured_sizes = array('Q')  # Byte size of each captured_paths entry, taken at capture
         self.audio_file = None
         self.session_id = None
+        self._photo_path_prefix = None  # SAVE_DIR/<session_id>_photo_, set by start()
+        self._photo_suffix = f".{IMAGE_FORMAT}"
         self.lock = threading.Lock()
-        self.stop_photo_capture = False
+        self._stop_evt = threading.Event()  # Set to end the photo loop
+        self._client = None  # UploadClient, created on first upload
+        self._upload_q = None  # Files for the background uploader (None ends it)
+        self._uploader = None
+        self.uploaded = set()  # Paths already uploaded this session
     
     def start(self):
         """Start recording session."""
@@ -92,21 +177,30 @@ class RecordingSession:
                 return False
             
             self.is_recording = True
-            self.stop_photo_capture = False
-            self.captured_photos = []
+            self._stop_evt.clear()
+            self.captured_paths = []
+            self.captured_sizes = array('Q')
+            self.uploaded = set()
             
             # Generate session ID
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.session_id = f"session_{timestamp}"
-            
-            # Create directories
-            os.makedirs(SAVE_DIR, exist_ok=True)
-            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            self._photo_path_prefix = os.path.join(SAVE_DIR, f"{self.session_id}_photo_")
             
             # Start audio recording
             self.audio_file = os.path.join(RECORDINGS_DIR, f"{self.session_id}.wav")
             self._start_audio_recording()
             
+            # Open the camera once for the whole session
+            if PICAMERA_AVAILABLE:
+                self._start_camera()
+            
+            # Upload photos while recording instead of all at the end
+            if UPLOAD_ENABLED and UPLOAD_AVAILABLE:
+                self._upload_q = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+                self._uploader = threading.Thread(target=self._upload_worker, daemon=True)
+                self._uploader.start()
+            
             # Start photo capture thread
             self.photo_thread = threading.Thread(target=self._capture_photos_loop, daemon=True)
             self.photo_thread.start()
@@ -129,172 +223,262 @@ class RecordingSession:
             print(f"⏹️  Stopping recording...")
             print(f"{'='*50}")
             
-            # Stop photo capture
-            self.stop_photo_capture = True
+            # Stop photo capture (wakes the loop out of its interval wait)
+            self._stop_evt.set()
             
             # Stop audio recording
             self._stop_audio_recording()
             
-            # Wait for photo thread to finish
-            if self.photo_thread and self.photo_thread.is_alive():
-                self.photo_thread.join(timeout=3)
+            # Wait for photo thread to finish its current capture (each one is
+            # bounded: rpicam-still has a timeout, picamera2 returns per frame),
+            # so the camera is never released under it and no photo is queued
+            # after the end-of-session marker
+            if self.photo_thread is not None:
+                self.photo_thread.join()
+            self._stop_camera()
+            
+            # Audio goes last, then the end-of-session marker
+            if self._upload_q is not None:
+                if self.audio_file and os.path.exists(self.audio_file):
+                    self._queue_upload(self.audio_file)
+                self._upload_q.put(None)
             
             self.is_recording = False
             
             print(f"✓ Recording stopped")
-            print(f"  Photos captured: {len(self.captured_photos)}")
+            print(f"  Photos captured: {len(self.captured_paths)}")
             if self.audio_file and os.path.exists(self.audio_file):
                 size_mb = os.path.getsize(self.audio_file) / (1024 * 1024)
                 print(f"  Audio file: {os.path.basename(self.audio_file)} ({size_mb:.2f} MB)")
             
             return True
     
+    def _start_camera(self):
+        """Configure and warm up the camera so each photo skips libcamera setup."""
+        import capture_image
+        camera = capture_image.get_camera(resolution=(WIDTH, HEIGHT))
+        if camera is None:
+            print("⚠ Camera failed to start, falling back to rpicam-still")
+            return
+        self.camera = camera.camera
+        self.camera.options["quality"] = QUALITY
+        self.frame_size = (WIDTH, HEIGHT)
+        try:
+            # Fast shutter speed for snappy shots, as with rpicam-still --shutter
+            self.camera.set_controls({"ExposureTime": SHUTTER_SPEED})
+        except Exception as e:
+            print(f"Note: Shutter speed control not available: {e}")
+    
+    def _stop_camera(self):
+        """Stop and close the session's camera."""
+        if self.camera is not None:
+            from capture_image import release_camera
+            release_camera()
+            self.camera = None
+    
     def _start_audio_recording(self):
-        """Start audio recording in background."""
+        """
+        Start audio recording in background.
+        
+        PCM is read into mic_test's preallocated ring and written to the WAV
+        in large batches by its writer thread; nothing is re-read from disk.
+        """
         try:
-            cmd = [
-                "arecord",
-                "-D", "hw:0,0",  # I2S device
-                "-f", AUDIO_FORMAT,
-                "-r", str(AUDIO_SAMPLE_RATE),
-                "-c", str(AUDIO_CHANNELS),
-                self.audio_file
-            ]
-            
-            self.audio_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            self.audio_stream = CaptureStream(AUDIO_SAMPLE_RATE)
+            self.audio_stream.start()
+            self.audio_stream.start_recording(self.audio_file)
         except Exception as e:
             print(f"⚠ Error starting audio recording: {e}")
-            self.audio_process = None
+            self._stop_audio_recording()
     
     def _stop_audio_recording(self):
-        """Stop audio recording."""
-        if self.audio_process:
+        """Stop audio recording (the WAV header sizes are patched here)."""
+        if self.audio_stream:
             try:
-                self.audio_process.terminate()
-                self.audio_process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self.audio_process.kill()
-                self.audio_process.wait()
+                _, dropped = self.audio_stream.stop_recording()
+                if dropped:
+                    print(f"⚠ {dropped} audio period(s) dropped - storage could not keep up")
             except Exception as e:
                 print(f"⚠ Error stopping audio: {e}")
             finally:
-                self.audio_process = None
+                self.audio_stream.close()
+                self.audio_stream = None
     
     def _capture_photos_loop(self):
         """Capture photos every 2 seconds in a loop."""
+        pin_thread(PHOTO_CPUS)
         photo_count = 0
         
-        while not self.stop_photo_capture:
+        while not self._stop_evt.is_set():
             try:
                 # Capture photo
                 photo_count += 1
-                filename = f"{self.session_id}_photo_{photo_count:04d}.{IMAGE_FORMAT}"
-                filepath = os.path.join(SAVE_DIR, filename)
+                filepath = f"{self._photo_path_prefix}{photo_count:04d}{self._photo_suffix}"
                 
-                if self._capture_photo(filepath):
-                    with self.lock:
-                        self.captured_photos.append(filepath)
-                    print(f"📸 Photo {photo_count} captured: {os.path.basename(filepath)}")
+                size = self._capture_photo(filepath)
+                if size:
+                    # No lock: only this thread appends while recording, and
+                    # stop() reads the lists after joining it
+                    self.captured_paths.append(filepath)
+                    self.captured_sizes.append(size)
+                    self._queue_upload(filepath)
+                    log.info(f"📸 Photo {photo_count} captured: {os.path.basename(filepath)}")
                 else:
-                    print(f"⚠ Photo {photo_count} capture failed")
+                    log.warning(f"⚠ Photo {photo_count} capture failed")
                 
-                # Wait for next capture (with small checks to allow early stop)
-                elapsed = 0
-                while elapsed < PHOTO_INTERVAL and not self.stop_photo_capture:
-                    time.sleep(0.1)
-                    elapsed += 0.1
+                # Wait for next capture; returns at once when stop() sets the event
+                if self._stop_evt.wait(PHOTO_INTERVAL):
+                    break
                     
             except Exception as e:
-                print(f"⚠ Error in photo capture loop: {e}")
+                log.warning(f"⚠ Error in photo capture loop: {e}")
                 break
     
     def _capture_photo(self, filepath):
-        """Capture a single photo using rpicam-still with fast shutter speed."""
+        """
+        Capture a single photo from the session camera, or rpicam-still as a fallback.
+        
+        Returns:
+            int: Size of the written file in bytes (0 if the capture failed)
+        """
+        if self.camera is not None:
+            try:
+                width, height = self.frame_size
+                frame = self.camera.capture_array("main") if _tj is not None else None
+                if frame is not None and frame.shape[1] == width:
+                    # Unpadded YUV420 planes go to libjpeg-turbo as-is
+                    jpeg = _tj.encode_from_yuv(frame, height, width,
+                                               quality=QUALITY, jpeg_subsample=TJSAMP_420)
+                    with open(filepath, 'wb') as f:
+                        f.write(jpeg)
+                    return len(jpeg)
+                self.camera.capture_file(filepath)
+                return os.path.getsize(filepath)
+            except Exception as e:
+                log.warning(f"⚠ Capture error: {e}")
+                return 0
+        
         try:
-            cmd = [
-                "rpicam-still",
-                "-o", filepath,
-                "--width", str(RESOLUTION.split("x")[0]),
-                "--height", str(RESOLUTION.split("x")[1]),
-                "--quality", str(QUALITY),
-                "--timeout", "1000",
-                "--shutter", str(SHUTTER_SPEED),  # Fast shutter speed for snappy shots
-                "--nopreview"
-            ]
-            
+            # Output is never read: no pipes to allocate or decode
             result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+                [*_CMD_PREFIX, "-o", filepath],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=5
             )
             
-            return result.returncode == 0 and os.path.exists(filepath) and os.path.getsize(filepath) > 0
+            return os.path.getsize(filepath) if result.returncode == 0 else 0
         except Exception as e:
-            print(f"⚠ Capture error: {e}")
-            return False
+            log.warning(f"⚠ Capture error: {e}")
+            return 0
+    
+    def _get_client(self):
+        """Return the UploadClient, creating it on first use."""
+        if self._client is None:
+            # One pooled session for every upload: connections (and TLS) are reused
+            self._client = UploadClient(
+                UPLOAD_SERVER_URL,
+                timeout=UPLOAD_TIMEOUT,
+                max_file_size=UPLOAD_MAX_SIZE_MB * 1024 * 1024,
+                session=create_session(pool_maxsize=UPLOAD_WORKERS)
+            )
+        return self._client
+    
+    def _queue_upload(self, filepath):
+        """Hand a finished file to the background uploader (left for upload_files() if full)."""
+        if self._upload_q is not None:
+            try:
+                self._upload_q.put_nowait(filepath)
+            except queue.Full:
+                pass
+    
+    def _upload_worker(self):
+        """Upload files as they are produced, until the end-of-session marker."""
+        client = self._get_client()
+        while True:
+            filepath = self._upload_q.get()
+            if filepath is None:
+                break
+            try:
+                result = client.upload_file(filepath, verbose=False)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            if result["success"]:
+                self.uploaded.add(filepath)
+                print(f"☁️  Uploaded: {os.path.basename(filepath)}")
+            # Failures are retried by upload_files() after the session
     
     def upload_files(self):
-        """Upload all captured files to cloud."""
+        """Upload all captured files to cloud (anything the background uploader missed)."""
         if not UPLOAD_AVAILABLE or not UPLOAD_ENABLED:
             print("⚠ Upload not available or disabled")
             return False
         
+        if self._uploader is not None:
+            if self._uploader.is_alive():
+                print("⏳ Finishing background uploads...")
+            self._uploader.join()
+            self._uploader = None
+            self._upload_q = None
+        
         files_to_upload = []
         
         # Add audio file
-        if self.audio_file and os.path.exists(self.audio_file):
-            files_to_upload.append(("audio", self.audio_file))
+        if self.audio_file and self.audio_file not in self.uploaded:
+            try:
+                files_to_upload.append(("audio", self.audio_file, os.path.getsize(self.audio_file)))
+            except OSError:
+                pass  # No recording was written
         
-        # Add all photos
-        for photo_path in self.captured_photos:
-            if os.path.exists(photo_path):
-                files_to_upload.append(("photo", photo_path))
+        # Add all photos (sizes were recorded at capture; no per-file stat)
+        for photo_path, size in zip(self.captured_paths, self.captured_sizes):
+            if photo_path not in self.uploaded:
+                files_to_upload.append(("photo", photo_path, size))
         
-        if not files_to_upload:
+        if not files_to_upload and not self.uploaded:
             print("⚠ No files to upload")
             return False
         
-        print(f"\n{'='*50}")
-        print(f"☁️  Uploading {len(files_to_upload)} file(s) to cloud...")
-        print(f"{'='*50}")
-        
         max_file_size_bytes = UPLOAD_MAX_SIZE_MB * 1024 * 1024
-        success_count = 0
+        success_count = len(self.uploaded)
         fail_count = 0
         
-        for file_type, filepath in files_to_upload:
-            try:
-                file_size = os.path.getsize(filepath)
-                if file_size > max_file_size_bytes:
-                    print(f"⚠ {os.path.basename(filepath)} too large ({file_size / (1024*1024):.2f}MB), skipping")
+        if files_to_upload:
+            print(f"\n{'='*50}")
+            print(f"☁️  Uploading {len(files_to_upload)} file(s) to cloud...")
+            print(f"{'='*50}")
+        
+        pending = []
+        for file_type, filepath, file_size in files_to_upload:
+            if file_size > max_file_size_bytes:
+                print(f"⚠ {os.path.basename(filepath)} too large ({file_size / (1024*1024):.2f}MB), skipping")
+                fail_count += 1
+                continue
+            pending.append((file_type, filepath))
+        
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = {}
+            for file_type, filepath in pending:
+                print(f"📤 Uploading {file_type}: {os.path.basename(filepath)}...")
+                # Less verbose for batch uploads
+                future = executor.submit(self._get_client().upload_file, filepath, verbose=False)
+                futures[future] = filepath
+            
+            for future in as_completed(futures):
+                filepath = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  ✗ Error uploading {os.path.basename(filepath)}: {e}")
                     fail_count += 1
                     continue
                 
-                print(f"📤 Uploading {file_type}: {os.path.basename(filepath)}...")
-                result = upload_file(
-                    filepath,
-                    server_url=UPLOAD_SERVER_URL,
-                    max_file_size=max_file_size_bytes,
-                    timeout=UPLOAD_TIMEOUT,
-                    check_mem=True,
-                    verbose=False  # Less verbose for batch uploads
-                )
-                
                 if result["success"]:
                     print(f"  ✓ Uploaded: {os.path.basename(filepath)}")
                     success_count += 1
                 else:
-                    print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
+                    print(f"  ✗ Failed {os.path.basename(filepath)}: {result.get('error', 'Unknown error')}")
                     fail_count += 1
-                    
-            except Exception as e:
-                print(f"  ✗ Error uploading {os.path.basename(filepath)}: {e}")
-                fail_count += 1
         
         print(f"\n{'='*50}")
         print(f"📊 Upload Summary:")
@@ -307,27 +491,14 @@ class RecordingSession:
 
 def check_dependencies():
     """Check if required tools are available."""
-    checks = {
-        "rpicam-still": False,
-        "arecord": False,
+    # PATH lookups done in-process; no `which` subprocesses
+    return {
+        "picamera2": PICAMERA_AVAILABLE,
+        "rpicam-still": shutil.which("rpicam-still") is not None,
+        "pyalsaaudio": ALSAAUDIO_AVAILABLE,
+        "arecord": shutil.which("arecord") is not None,
         "gpiozero": GPIOZERO_AVAILABLE
     }
-    
-    # Check rpicam-still
-    try:
-        result = subprocess.run(["which", "rpicam-still"], capture_output=True, text=True)
-        checks["rpicam-still"] = result.returncode == 0
-    except:
-        pass
-    
-    # Check arecord
-    try:
-        result = subprocess.run(["which", "arecord"], capture_output=True, text=True)
-        checks["arecord"] = result.returncode == 0
-    except:
-        pass
-    
-    return checks
 
 
 def main():
@@ -343,6 +514,10 @@ def main():
     print(f"Audio save: {RECORDINGS_DIR}")
     print("=" * 50)
     
+    # Create directories once here, not on every session start
+    os.makedirs(SAVE_DIR, exist_ok=True)
+    os.makedirs(RECORDINGS_DIR, exist_ok=True)
+    
     # Check dependencies
     print("\nChecking dependencies...")
     deps = check_dependencies()
@@ -350,12 +525,12 @@ def main():
         status = "✓" if available else "✗"
         print(f"  {status} {tool}")
     
-    if not all([deps["rpicam-still"], deps["arecord"], deps["gpiozero"]]):
+    if not all([deps["picamera2"] or deps["rpicam-still"], deps["pyalsaaudio"] or deps["arecord"], deps["gpiozero"]]):
         print("\n⚠ Missing dependencies. Install with:")
-        if not deps["rpicam-still"]:
-            print("  sudo apt-get install -y libcamera-apps")
-        if not deps["arecord"]:
-            print("  sudo apt-get install -y alsa-utils")
+        if not deps["picamera2"] and not deps["rpicam-still"]:
+            print("  sudo apt-get install -y python3-picamera2 libcamera-apps")
+        if not deps["pyalsaaudio"] and not deps["arecord"]:
+            print("  sudo apt-get install -y python3-alsaaudio alsa-utils")
         if not deps["gpiozero"]:
             print("  sudo apt-get install -y python3-gpiozero")
         sys.exit(1)
@@ -372,10 +547,26 @@ def main():
     
     # Setup buttons
     print(f"\nSetting up buttons...")
-    red_button = Button(RED_BUTTON_PIN, pull_up=True)
+    red_button = Button(RED_BUTTON_PIN, pull_up=True, bounce_time=BOUNCE_TIME)
     second_button = Button(SECOND_BUTTON_PIN, pull_up=True)  # Reserved for future use
+    red_pressed = threading.Event()
+    last_press = -BUTTON_DEBOUNCE
+    
+    def on_red_press():
+        # Runs on the edge callback; the main thread does the start/stop work
+        nonlocal last_press
+        now = time.monotonic()
+        if now - last_press < BUTTON_DEBOUNCE:
+            return
+        last_press = now
+        red_pressed.set()
+    
+    red_button.when_pressed = on_red_press
     print("✓ Buttons ready")
     
+    # Threads started from here on inherit these cores; the photo loop moves itself
+    pin_thread(MAIN_CPUS)
+    
     # Create recording session
     session = RecordingSession()
     
@@ -387,18 +578,19 @@ def main():
     print("Press Ctrl+C to exit")
     print("=" * 50)
     
+    _log_listener.start()
     try:
         while True:
-            # Wait for red button press
-            red_button.wait_for_press()
-            time.sleep(0.2)  # Debounce
+            # Sleep until the red button's edge callback fires
+            red_pressed.wait()
+            red_pressed.clear()
             
             if not session.is_recording:
                 # Start recording
                 if session.start():
                     # Wait for second press to stop
-                    red_button.wait_for_press()
-                    time.sleep(0.2)  # Debounce
+                    red_pressed.wait()
+                    red_pressed.clear()
                     
                     # Stop recording
                     if session.stop():
@@ -407,19 +599,20 @@ def main():
                             session.upload_files()
                         else:
                             print("\n⚠ Upload skipped (disabled or unavailable)")
+                    # Presses made while stopping/uploading don't start a new session
+                    red_pressed.clear()
             else:
                 # Already recording, this should not happen, but handle it
                 print("⚠ Already recording, ignoring press")
             
-            # Small delay before next cycle
-            time.sleep(0.5)
-            
     except KeyboardInterrupt:
         print("\n\nShutting down...")
         if session.is_recording:
             print("Stopping active recording...")
             session.stop()
         print("Done!")
+    finally:
+        _log_listener.stop()  # Flushes queued photo messages
 
 
 if __name__ == "__main__":